@@ -0,0 +1,55 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY_TEMPLATE = 'version:{scope}'
+
+
+def get_versions(*scopes):
+    """
+    Версии областей кеша.
+
+    Версия — время последнего изменения данных области. Если версии нет
+    в кеше, она создаётся заново с текущим временем.
+    """
+    keys = [VERSION_KEY_TEMPLATE.format(scope=scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    missing = {key: time.time() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(*scopes):
+    """Отметить изменение данных областей после фиксации транзакции."""
+    def bump():
+        now = time.time()
+        cache.set_many(
+            {VERSION_KEY_TEMPLATE.format(scope=scope): now
+             for scope in scopes},
+            timeout=None
+        )
+    transaction.on_commit(bump)
+
+
+def make_key(prefix, request, scopes, exclude=()):
+    """
+    Ключ кеша по адресу, нормализованной строке запроса и версиям.
+
+    Адрес берётся вместе с хостом, так как ссылки пагинации в ответе
+    абсолютные.
+    """
+    params = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        if key not in exclude
+        for value in values
+    )
+    versions = '-'.join(repr(version) for version in get_versions(*scopes))
+    path = request.build_absolute_uri(request.path)
+    signature = f'{path}?{urlencode(params)}#{versions}'
+    return f'{prefix}:{hashlib.md5(signature.encode()).hexdigest()}'
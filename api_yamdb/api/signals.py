@@ -0,0 +1,72 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from api.cache import bump_versions
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.signals import (
+    deletion_scheduled, review_comment_count_changed, title_rating_changed
+)
+
+User = get_user_model()
+
+
+@receiver((post_save, post_delete), sender=Title)
+@receiver(deletion_scheduled, sender=Title)
+def title_changed(sender, instance, **kwargs):
+    bump_versions('titles', f'title:{instance.pk}')
+
+
+@receiver(deletion_scheduled, sender=Title)
+def title_hidden(sender, instance, **kwargs):
+    bump_versions(f'title:{instance.pk}:reviews', 'reviews', 'comments')
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        title_ids = (instance.pk,)
+    elif pk_set is not None:
+        title_ids = pk_set
+    else:
+        title_ids = ()
+    bump_versions('titles', *(f'title:{pk}' for pk in title_ids))
+
+
+@receiver(title_rating_changed)
+def rating_changed(sender, title_ids, **kwargs):
+    bump_versions('ratings', *(f'title:{pk}' for pk in title_ids))
+
+
+@receiver(review_comment_count_changed)
+def comment_count_changed(sender, review_ids, **kwargs):
+    bump_versions('comment-counts')
+
+
+@receiver((post_save, post_delete), sender=Genre)
+def genre_changed(sender, **kwargs):
+    bump_versions('genres')
+
+
+@receiver((post_save, post_delete), sender=Category)
+def category_changed(sender, **kwargs):
+    bump_versions('categories')
+
+
+@receiver((post_save, post_delete), sender=Review)
+def review_changed(sender, instance, **kwargs):
+    bump_versions(f'title:{instance.title_id}:reviews', 'reviews')
+
+
+@receiver((post_save, post_delete), sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    bump_versions(f'review:{instance.review_id}:comments', 'comments')
+
+
+@receiver((post_save, post_delete), sender=User)
+@receiver(deletion_scheduled, sender=User)
+def user_changed(sender, **kwargs):
+    bump_versions('users')
@@ -2,7 +2,9 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from api.v1.views import (
-    CategoryViewSet, CommentViewSet, GenreViewSet, ReviewViewSet, TitleViewSet
+    CategoryViewSet, CommentViewSet, GenreViewSet, ModerationViewSet,
+    ReviewViewSet, TitleCommentViewSet, TitleViewSet, UserCommentViewSet,
+    UserReviewViewSet
 )
 from users.views import GetToken, UserSignUp, UserViewSet
 
@@ -11,6 +13,17 @@ router_v1.register('titles', TitleViewSet, basename='titles')
 router_v1.register('genres', GenreViewSet, basename='genres')
 router_v1.register('categories', CategoryViewSet, basename='categories')
 router_v1.register('users', UserViewSet, basename='users')
+router_v1.register('moderation', ModerationViewSet, basename='moderation')
+router_v1.register(
+    r'users/(?P<username>[\w.@+-]+)/reviews',
+    UserReviewViewSet,
+    basename='user-reviews'
+)
+router_v1.register(
+    r'users/(?P<username>[\w.@+-]+)/comments',
+    UserCommentViewSet,
+    basename='user-comments'
+)
 router_v1.register(
     r'^titles/(?P<title_id>\d+)/reviews', ReviewViewSet, basename='reviews'
 )
@@ -19,6 +32,11 @@ router_v1.register(
     CommentViewSet,
     basename='comments'
 )
+router_v1.register(
+    r'titles/(?P<title_id>\d+)/comments',
+    TitleCommentViewSet,
+    basename='title-comments'
+)
 
 auth_urls = [
     path('signup/', UserSignUp.as_view(), name='signup'),
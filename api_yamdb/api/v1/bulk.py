@@ -0,0 +1,195 @@
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from rest_framework import status
+
+from api.cache import bump_versions
+from api.v1.serializers import TitleBulkItemSerializer
+from reviews.models import Category, Genre, Title
+
+TitleGenre = Title.genre.through
+
+
+def reserves_title_ids():
+    """Назначаются ли id новых произведений до вставки."""
+    return not connection.features.can_return_rows_from_bulk_insert
+
+
+def lock_title_ids():
+    """
+    Сразу сделать транзакцию SQLite пишущей.
+
+    Транзакции SQLite по умолчанию отложенные и берут блокировку записи
+    только на первой записи. Без этого два пакета могли бы прочитать
+    один и тот же последний id и столкнуться на вставке. Запрос ничего
+    не меняет, но ждёт завершения чужой записи до чтения id.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'UPDATE sqlite_sequence SET seq = seq WHERE name = %s',
+            [Title._meta.db_table]
+        )
+
+
+def reserve_title_ids(count):
+    """
+    Выделить идентификаторы для новых произведений.
+
+    SQLite не возвращает первичные ключи из bulk_create, поэтому они
+    назначаются заранее после последнего выданного значения. Вызывается
+    внутри транзакции записи после lock_title_ids.
+    """
+    last_id = Title.objects.aggregate(last_id=Max('id'))['last_id'] or 0
+    if connection.vendor != 'sqlite':
+        return range(last_id + 1, last_id + count + 1)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT seq FROM sqlite_sequence WHERE name = %s',
+            [Title._meta.db_table]
+        )
+        row = cursor.fetchone()
+    if row is not None:
+        last_id = max(last_id, row[0])
+    return range(last_id + 1, last_id + count + 1)
+
+
+def save_titles(items):
+    """
+    Создать и частично обновить произведения одним пакетом.
+
+    Элементы с `id` обновляются, остальные создаются. Слаги жанров и
+    категорий проверяются одним запросом на весь пакет, запись идёт
+    через bulk_create/bulk_update в одной транзакции. Возвращает
+    результаты в порядке элементов запроса.
+    """
+    results = [None] * len(items)
+    valid = {}
+    for index, item in enumerate(items):
+        partial = isinstance(item, dict) and 'id' in item
+        serializer = TitleBulkItemSerializer(data=item, partial=partial)
+        if serializer.is_valid():
+            valid[index] = serializer.validated_data
+        else:
+            results[index] = get_error_result(serializer.errors)
+
+    genres = Genre.objects.in_bulk(
+        {slug for data in valid.values() for slug in data.get('genre', ())},
+        field_name='slug'
+    )
+    categories = Category.objects.in_bulk(
+        {data['category'] for data in valid.values() if 'category' in data},
+        field_name='slug'
+    )
+    with transaction.atomic():
+        if reserves_title_ids() and connection.vendor == 'sqlite' and any(
+            'id' not in data for data in valid.values()
+        ):
+            lock_title_ids()
+        titles = Title.objects.visible().in_bulk(
+            {data['id'] for data in valid.values() if 'id' in data}
+        )
+        seen_ids = set()
+        for index, data in list(valid.items()):
+            errors = get_errors(data, titles, genres, categories, seen_ids)
+            if errors:
+                del valid[index]
+                results[index] = get_error_result(errors)
+        write_titles(valid, titles, genres, categories, results)
+    return results
+
+
+def get_error_result(errors):
+    return {'status': status.HTTP_400_BAD_REQUEST, 'errors': errors}
+
+
+def get_errors(data, titles, genres, categories, seen_ids):
+    """Ошибки элемента, которые видны только на уровне всего пакета."""
+    errors = {}
+    if 'id' in data:
+        if data['id'] not in titles:
+            errors['id'] = ['Произведение не найдено.']
+        elif data['id'] in seen_ids:
+            errors['id'] = ['Произведение уже изменяется в этом запросе.']
+        seen_ids.add(data['id'])
+    unknown_genres = [
+        slug for slug in data.get('genre', ()) if slug not in genres
+    ]
+    if unknown_genres:
+        errors['genre'] = [
+            f'Жанр {slug} не существует.' for slug in unknown_genres
+        ]
+    if 'category' in data and data['category'] not in categories:
+        errors['category'] = [
+            f'Категория {data["category"]} не существует.'
+        ]
+    return errors
+
+
+def prepare_titles(valid, titles, genres, categories):
+    """Разложить проверенные элементы на новые и изменённые произведения."""
+    new_titles, updated_titles, title_genres = {}, {}, {}
+    update_fields = set()
+    for index, data in valid.items():
+        fields = {
+            name: value for name, value in data.items()
+            if name not in ('id', 'genre', 'category')
+        }
+        if 'category' in data:
+            fields['category'] = categories[data['category']]
+        if 'id' in data:
+            title = titles[data['id']]
+            for name, value in fields.items():
+                setattr(title, name, value)
+            updated_titles[index] = title
+            update_fields.update(fields)
+        else:
+            new_titles[index] = Title(**fields)
+        if 'genre' in data:
+            title_genres[index] = dict.fromkeys(
+                genres[slug].id for slug in data['genre']
+            )
+    return new_titles, updated_titles, update_fields, title_genres
+
+
+def write_titles(valid, titles, genres, categories, results):
+    """Записать проверенные элементы пакета и заполнить их результаты."""
+    new_titles, updated_titles, update_fields, title_genres = (
+        prepare_titles(valid, titles, genres, categories)
+    )
+    if reserves_title_ids():
+        title_ids = reserve_title_ids(len(new_titles))
+        for title, title_id in zip(new_titles.values(), title_ids):
+            title.id = title_id
+    Title.objects.bulk_create(new_titles.values())
+    if updated_titles:
+        # bulk_update, в отличие от save(), не заполняет поля auto_now.
+        now = timezone.now()
+        for title in updated_titles.values():
+            title.updated_at = now
+        Title.objects.bulk_update(
+            updated_titles.values(), update_fields | {'updated_at'}
+        )
+
+    written = {**new_titles, **updated_titles}
+    TitleGenre.objects.filter(title_id__in=[
+        written[index].id for index in title_genres
+        if index in updated_titles
+    ]).delete()
+    TitleGenre.objects.bulk_create(
+        TitleGenre(title_id=written[index].id, genre_id=genre_id)
+        for index, genre_ids in title_genres.items()
+        for genre_id in genre_ids
+    )
+
+    for index, title in written.items():
+        results[index] = {
+            'status': (
+                status.HTTP_200_OK if index in updated_titles
+                else status.HTTP_201_CREATED
+            ),
+            'id': title.id,
+        }
+    if written:
+        bump_versions(
+            'titles', *(f'title:{title.id}' for title in written.values())
+        )
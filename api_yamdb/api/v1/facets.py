@@ -0,0 +1,66 @@
+from django.db.models import Count, F, Value
+
+from reviews.models import Title
+
+TitleGenre = Title.genre.through
+
+
+def count_genres(queryset):
+    return TitleGenre.objects.filter(
+        title_id__in=queryset.values('pk')
+    ).values(value=F('genre__slug')).annotate(count=Count('title_id'))
+
+
+def count_categories(queryset):
+    return queryset.filter(category__isnull=False).values(
+        value=F('category__slug')
+    ).annotate(count=Count('pk'))
+
+
+def count_decades(queryset):
+    return queryset.values(value=F('year') / 10 * 10).annotate(
+        count=Count('pk')
+    )
+
+
+def sort_by_count(rows, key):
+    return [
+        {key: value, 'count': count}
+        for value, count in sorted(rows, key=lambda row: (-row[1], row[0]))
+    ]
+
+
+def sort_by_value(rows, key):
+    return [{key: value, 'count': count} for value, count in sorted(rows)]
+
+
+FACETS = {
+    'genre': (count_genres, 'slug', sort_by_count),
+    'category': (count_categories, 'slug', sort_by_count),
+    'year': (count_decades, 'decade', sort_by_value),
+}
+
+
+def get_facets(queryset, names):
+    """
+    Количество произведений по жанрам, категориям и десятилетиям.
+
+    Каждая группа считается GROUP BY по уже отфильтрованному набору
+    произведений, а все группы объединяются через UNION ALL и читаются
+    одним запросом.
+    """
+    queryset = queryset.order_by()
+    rows = {name: [] for name in names}
+    counts = [
+        FACETS[name][0](queryset).annotate(
+            facet=Value(name)
+        ).values_list('facet', 'value', 'count')
+        for name in rows
+    ]
+    for name, value, count in counts[0].union(*counts[1:], all=True):
+        rows[name].append((value, count))
+    facets = {}
+    for name, group in rows.items():
+        _, key, sort = FACETS[name]
+        facets[name] = sort(group, key)
+    return facets
@@ -1,14 +1,164 @@
+from django.db import connection
+from django.db.models import Case, FloatField, IntegerField, When
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django_filters import FilterSet, CharFilter
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
 
 from reviews.models import Title
+from reviews.search import SEARCH_TABLE, to_search_query
+from users.constants import TITLE_IDS_LIMIT
 
 
 class TitleFilter(FilterSet):
+    """
+    Фильтры списка произведений.
+
+    Жанры перечисляются через запятую: `genre` отбирает произведения
+    хотя бы с одним из жанров, `genre_all` — со всеми. Оба фильтра
+    строятся на подзапросах `id IN (...)` к связям с жанрами, поэтому не
+    размножают строки и не требуют DISTINCT. В отличие от
+    коррелированного EXISTS такой подзапрос SQLite выполняет по индексу
+    (genre_id, title_id), а не проверкой каждого произведения.
+    """
 
     category = CharFilter(field_name='category__slug')
-    genre = CharFilter(field_name='genre__slug')
+    genre = CharFilter(method='filter_genre')
+    genre_all = CharFilter(method='filter_genre_all')
     name = CharFilter(field_name='name')
 
     class Meta:
         model = Title
-        fields = ('genre', 'category', 'year', 'name')
+        fields = ('genre', 'genre_all', 'category', 'year', 'name')
+
+    @staticmethod
+    def with_genres(slugs):
+        return Title.genre.through.objects.filter(
+            genre__slug__in=slugs
+        ).values('title_id')
+
+    @staticmethod
+    def split_slugs(value):
+        return list(dict.fromkeys(
+            slug.strip() for slug in value.split(',') if slug.strip()
+        ))
+
+    def filter_genre(self, queryset, name, value):
+        return queryset.filter(
+            pk__in=self.with_genres(self.split_slugs(value))
+        )
+
+    def filter_genre_all(self, queryset, name, value):
+        for slug in self.split_slugs(value):
+            queryset = queryset.filter(pk__in=self.with_genres([slug]))
+        return queryset
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    """
+    Полнотекстовый поиск по названию и описанию произведения.
+
+    Совпадения ищутся в индексе FTS5 и упорядочиваются по релевантности,
+    если в запросе не задан параметр ordering. Отбор и релевантность
+    заданы подзапросами, поэтому выборка работает и как подзапрос
+    `id IN (...)`. Вне SQLite поиск идёт по вхождению в название.
+    """
+
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '').strip()
+        query = to_search_query(text)
+        if not query:
+            return queryset
+        if connection.vendor != 'sqlite':
+            return queryset.filter(name__icontains=text)
+        table = connection.ops.quote_name(queryset.model._meta.db_table)
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s',
+            [query]
+        )).annotate(search_rank=RawSQL(
+            f'SELECT rank FROM {SEARCH_TABLE} '
+            f'WHERE {SEARCH_TABLE} MATCH %s AND rowid = {table}.id',
+            [query], output_field=FloatField()
+        )).order_by('search_rank')
+
+
+class TitleIdsFilter(BaseFilterBackend):
+    """
+    Выборка произведений по списку id из параметра `ids`.
+
+    Произведения возвращаются в порядке id в запросе, отсутствующие id
+    пропускаются. Порядок из запроса важнее параметра ordering.
+    """
+
+    ids_param = 'ids'
+
+    @classmethod
+    def get_ids(cls, request):
+        value = request.query_params.get(cls.ids_param)
+        if value is None:
+            return None
+        try:
+            ids = [int(pk) for pk in value.split(',') if pk.strip()]
+        except ValueError:
+            raise ValidationError(
+                {cls.ids_param: ['Ожидается список id через запятую.']}
+            )
+        if len(ids) > TITLE_IDS_LIMIT:
+            raise ValidationError({cls.ids_param: [
+                f'Не больше {TITLE_IDS_LIMIT} id за один запрос.'
+            ]})
+        return list(dict.fromkeys(ids))
+
+    def filter_queryset(self, request, queryset, view):
+        ids = self.get_ids(request)
+        if ids is None:
+            return queryset
+        if not ids:
+            return queryset.none()
+        return queryset.filter(pk__in=ids).order_by(Case(
+            *(When(pk=pk, then=position) for position, pk in enumerate(ids)),
+            output_field=IntegerField(),
+        ))
+
+
+class UpdatedSinceFilter(BaseFilterBackend):
+    """
+    Объекты, изменённые начиная с момента из параметра `since`.
+
+    Момент передаётся в формате ISO 8601, без часового пояса считается
+    временем сервера. Граница включается: объекты с тем же updated_at
+    придут повторно, но не потеряются. Выборка упорядочена по
+    (updated_at, id) и идёт по индексу с этими полями.
+    """
+
+    since_param = 'since'
+    invalid_since_message = 'Ожидается дата и время в формате ISO 8601.'
+
+    @classmethod
+    def get_since(cls, request):
+        value = request.query_params.get(cls.since_param)
+        if value is None:
+            return None
+        try:
+            since = parse_datetime(value.strip())
+        except ValueError:
+            since = None
+        if since is None:
+            raise ValidationError(
+                {cls.since_param: [cls.invalid_since_message]}
+            )
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        return since
+
+    def filter_queryset(self, request, queryset, view):
+        since = self.get_since(request)
+        if since is None:
+            return queryset
+        return queryset.filter(updated_at__gte=since).order_by(
+            'updated_at', 'id'
+        )
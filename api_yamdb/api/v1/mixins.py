@@ -0,0 +1,195 @@
+import math
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from api.cache import get_versions, make_key
+from api.v1.filters import UpdatedSinceFilter
+from api.v1.pagination import TombstonePagination
+from api.v1.serializers import TombstoneSerializer
+from reviews.deletion import delete_now, schedule_deletion
+from reviews.models import Tombstone
+
+
+class ConditionalGetMixin:
+    """
+    Условные GET-запросы.
+
+    ETag и Last-Modified вычисляются по версиям областей кеша из
+    `get_validator_scopes` без сериализации ответа, поэтому на
+    совпавшие If-None-Match и If-Modified-Since сразу отдаётся 304.
+    `If-None-Match: *` совпадает с любым ETag, поэтому 304 на него
+    отдаётся только после того, как обработчик нашёл объект.
+    """
+
+    validator_scopes = ()
+
+    def get_validator_scopes(self):
+        return self.validator_scopes
+
+    @staticmethod
+    def matches_any_etag(request):
+        value = request.META.get('HTTP_IF_NONE_MATCH', '')
+        return value.strip() == '*'
+
+    def get_conditional_response(self, handler, request, *args, **kwargs):
+        scopes = self.get_validator_scopes()
+        etag = quote_etag(make_key(
+            f'etag:{request.accepted_renderer.format}', request, scopes
+        ).split(':')[-1])
+        last_modified = math.ceil(max(get_versions(*scopes)))
+        check = partial(
+            get_conditional_response,
+            request, etag=etag, last_modified=last_modified
+        )
+        response = None if self.matches_any_etag(request) else check()
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code == 200 and self.matches_any_etag(
+                request
+            ):
+                response = check()
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+
+class ConditionalListMixin(ConditionalGetMixin):
+    """Условные GET-запросы для списка объектов."""
+
+    def list(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class ConditionalRetrieveMixin(ConditionalGetMixin):
+    """Условные GET-запросы для отдельного объекта."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class CachedListMixin:
+    """
+    Кеширование ответа на запрос списка объектов.
+
+    Ответ не зависит от пользователя и хранится под ключом из пути,
+    нормализованной строки запроса и версий областей из
+    `get_list_cache_scopes`.
+    """
+
+    list_cache_scopes = ()
+
+    def get_list_cache_scopes(self):
+        return self.list_cache_scopes
+
+    def list(self, request, *args, **kwargs):
+        key = make_key('list', request, self.get_list_cache_scopes())
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+        response = super().list(request, *args, **kwargs)
+        cache.set(key, response.data, settings.LIST_CACHE_TIMEOUT)
+        return response
+
+
+class SparseFieldsetMixin:
+    """
+    Выбор полей ответа параметром `fields`.
+
+    Поля перечисляются через запятую и передаются сериализатору
+    аргументом `fields`. Вьюсет может по `get_requested_fields` сузить
+    запрос к БД. Параметр учитывается только в `sparse_fieldset_actions`.
+    """
+
+    fields_query_param = 'fields'
+    sparse_fieldset_actions = ('list', 'retrieve')
+
+    def get_requested_fields(self):
+        value = self.request.query_params.get(self.fields_query_param)
+        if self.action not in self.sparse_fieldset_actions or not value:
+            return None
+        fields = {name.strip() for name in value.split(',') if name.strip()}
+        unknown = fields - set(self.get_serializer_class().Meta.fields)
+        if unknown:
+            raise ValidationError({self.fields_query_param: [
+                f'Неизвестное поле: {name}.' for name in sorted(unknown)
+            ]})
+        return fields
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_requested_fields()
+        if fields is not None:
+            kwargs['fields'] = fields
+        return super().get_serializer(*args, **kwargs)
+
+
+class DeltaSyncMixin:
+    """
+    Синхронизация списка по изменениям.
+
+    С параметром `since` список содержит только изменённые объекты, а
+    пагинация по курсору идёт по (updated_at, id): объект, изменённый во
+    время обхода, переместится в конец и не будет пропущен. Удалённые
+    объекты отдаёт действие `deleted` по записям Tombstone.
+
+    Количество объектов для запросов с `since` не кешируется: updated_at
+    меняется и при пересчёте рейтинга или числа комментариев, а эти
+    записи не сбрасывают кеш количества.
+    """
+
+    sync_keyset_ordering = ('updated_at', 'id')
+    tombstone_pagination_class = TombstonePagination
+
+    def is_sync_request(self):
+        return UpdatedSinceFilter.since_param in self.request.query_params
+
+    def get_keyset_ordering(self):
+        if self.is_sync_request():
+            return self.sync_keyset_ordering
+        return self.keyset_ordering
+
+    def get_tombstone_parent_id(self):
+        return None
+
+    @action(detail=False, url_path='deleted')
+    def deleted(self, request, *args, **kwargs):
+        """Удалённые объекты, начиная с момента `since`."""
+        tombstones = Tombstone.objects.filter(
+            model_name=self.get_queryset().model._meta.model_name,
+            parent_id=self.get_tombstone_parent_id(),
+        )
+        since = UpdatedSinceFilter.get_since(request)
+        if since is not None:
+            tombstones = tombstones.filter(deleted_at__gte=since)
+        paginator = self.tombstone_pagination_class()
+        page = paginator.paginate_queryset(tombstones, request, view=self)
+        return paginator.get_paginated_response(
+            TombstoneSerializer(page, many=True).data
+        )
+
+
+class BackgroundDestroyMixin:
+    """
+    Удаление объекта с каскадом в фоне.
+
+    При включённой настройке CASCADE_DELETE_IN_BACKGROUND объект только
+    скрывается, а его отзывы и комментарии небольшими транзакциями
+    удаляет команда process_deletions. Иначе каскад удаляется в запросе.
+    """
+
+    def perform_destroy(self, instance):
+        if settings.CASCADE_DELETE_IN_BACKGROUND:
+            schedule_deletion(instance)
+        else:
+            delete_now(instance)
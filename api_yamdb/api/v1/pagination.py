@@ -0,0 +1,312 @@
+import base64
+import binascii
+import json
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import (
+    EmptyPage, Page, PageNotAnInteger, Paginator
+)
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from api.cache import make_key
+from api.v1.filters import TitleSearchFilter
+
+
+class KeysetPagination(BasePagination):
+    """
+    Пагинация по ключу сортировки.
+
+    Порядок задаётся методом `get_keyset_ordering` или атрибутом
+    `keyset_ordering` вьюсета, последнее поле в нём должно быть
+    уникальным. Курсор хранит значения этих полей у крайнего объекта
+    страницы, поэтому любая страница выбирается по индексу так же
+    быстро, как первая. Сортировка параметром `ordering` и сортировка
+    по релевантности при полнотекстовом поиске с курсором не сочетаются,
+    такие запросы отклоняются.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = 'Некорректный курсор.'
+    ordering_not_supported_message = (
+        'Сортировка не поддерживается при пагинации по курсору.'
+    )
+    search_not_supported_message = (
+        'Полнотекстовый поиск не поддерживается при пагинации по курсору.'
+    )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.check_ordering_param(request, view)
+        self.ordering = self.get_ordering(view)
+        position, reverse = self.decode_cursor(request)
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(self.invert(field) for field in ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(
+                self.get_position_filter(ordering, position)
+            )
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        self.page = results
+        return results
+
+    def check_ordering_param(self, request, view):
+        backends = getattr(view, 'filter_backends', ())
+        ordering_param = api_settings.ORDERING_PARAM
+        if ordering_param in request.query_params and any(
+            issubclass(backend, OrderingFilter) for backend in backends
+        ):
+            raise ValidationError(
+                {ordering_param: [self.ordering_not_supported_message]}
+            )
+        search_param = TitleSearchFilter.search_param
+        if request.query_params.get(search_param, '').strip() and any(
+            issubclass(backend, TitleSearchFilter) for backend in backends
+        ):
+            raise ValidationError(
+                {search_param: [self.search_not_supported_message]}
+            )
+
+    @staticmethod
+    def get_ordering(view):
+        get_keyset_ordering = getattr(view, 'get_keyset_ordering', None)
+        if get_keyset_ordering is not None:
+            return tuple(get_keyset_ordering())
+        return tuple(getattr(view, 'keyset_ordering', ('pk',)))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    @staticmethod
+    def invert(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def get_position_filter(ordering, position):
+        """
+        Условие «строго после позиции» для составного ключа.
+
+        Отдельное нестрогое условие на первое поле ключа позволяет SQLite
+        начать чтение индекса сразу с позиции курсора: одно условие из
+        OR индекс не ограничивает.
+        """
+        position_filter = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            position_filter |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        first = ordering[0]
+        lookup = 'lte' if first.startswith('-') else 'gte'
+        return Q(
+            **{f'{first.lstrip("-")}__{lookup}': position[0]}
+        ) & position_filter
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            position, reverse = cursor['p'], bool(cursor.get('r'))
+        except (binascii.Error, KeyError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or (
+            len(position) != len(self.ordering)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, obj, reverse):
+        position = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            if name == 'pk':
+                position.append(str(obj.pk))
+            else:
+                position.append(
+                    obj._meta.get_field(name).value_to_string(obj)
+                )
+        cursor = {'p': position}
+        if reverse:
+            cursor['r'] = 1
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(cursor, separators=(',', ':')).encode()
+        ).decode()
+        url = remove_query_param(
+            self.request.build_absolute_uri(),
+            PageNumberPagination.page_query_param
+        )
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+
+class TombstonePagination(KeysetPagination):
+    """Пагинация записей об удалении в порядке удаления."""
+
+    @staticmethod
+    def get_ordering(view):
+        return ('deleted_at', 'id')
+
+
+class CachedCountPage(Page):
+    """
+    Страница, границы которой определены выбранными строками.
+
+    Есть ли следующая страница, известно по лишней строке выборки, а не
+    по общему количеству, которое может быть оценкой.
+    """
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Пагинатор с кешированием общего количества объектов.
+
+    Точное количество хранится под ключом с версиями данных и
+    сбрасывается при записи. Если последнее известное количество для
+    того же набора фильтров не меньше PAGINATION_COUNT_ESTIMATE_THRESHOLD,
+    оно отдаётся как оценка без нового COUNT(*), пока не истечёт
+    PAGINATION_COUNT_ESTIMATE_TIMEOUT.
+
+    Количество только попадает в ответ: страница выбирается по строкам
+    с запасом в одну, поэтому устаревшая оценка не отрезает новые
+    объекты и не делает последние страницы недоступными.
+    """
+
+    def __init__(self, object_list, per_page, count_key=None,
+                 estimate_key=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_key = count_key
+        self.estimate_key = estimate_key
+
+    @cached_property
+    def count(self):
+        count = cache.get(self.count_key)
+        if count is not None:
+            return count
+        estimate = cache.get(self.estimate_key)
+        if (
+            estimate is not None
+            and estimate >= settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD
+        ):
+            return estimate
+        count = super().count
+        cache.set(
+            self.count_key, count, settings.PAGINATION_COUNT_CACHE_TIMEOUT
+        )
+        cache.set(
+            self.estimate_key, count,
+            settings.PAGINATION_COUNT_ESTIMATE_TIMEOUT
+        )
+        return count
+
+    def page(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('Номер страницы не является целым числом.')
+        if number < 1:
+            raise EmptyPage('Номер страницы меньше 1.')
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage('На этой странице нет результатов.')
+        return CachedCountPage(
+            rows[:self.per_page], number, self,
+            has_next=len(rows) > self.per_page
+        )
+
+
+class CachedCountPagination(PageNumberPagination):
+    """
+    Постраничная пагинация с кешированным количеством объектов.
+
+    Количество кешируется для вьюсетов с методом
+    `get_count_cache_scopes`, который возвращает области кеша, при
+    изменении которых количество нужно пересчитать, или None, если
+    количество для этого запроса кешировать нельзя.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        get_scopes = getattr(view, 'get_count_cache_scopes', None)
+        scopes = get_scopes() if get_scopes is not None else None
+        self.django_paginator_class = Paginator
+        if scopes is not None:
+            exclude = (self.page_query_param,)
+            self.django_paginator_class = partial(
+                CachedCountPaginator,
+                count_key=make_key('count', request, scopes, exclude),
+                estimate_key=make_key('count-estimate', request, (), exclude)
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+
+class PageNumberOrKeysetPagination(CachedCountPagination):
+    """
+    Постраничная пагинация с переходом на курсор по запросу.
+
+    Если в запросе есть параметр `cursor` (в том числе пустой), страница
+    выбирается по ключу сортировки без подсчёта общего количества.
+    """
+
+    keyset_pagination_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset_paginator = None
+        cursor_query_param = self.keyset_pagination_class.cursor_query_param
+        if cursor_query_param in request.query_params:
+            self.keyset_paginator = self.keyset_pagination_class()
+            return self.keyset_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset_paginator is not None:
+            return self.keyset_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
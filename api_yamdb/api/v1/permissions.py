@@ -25,6 +25,15 @@ class IsAdminModeratorAuthorOrReadOnly(permissions.BasePermission):
         )
 
 
+class IsAdminOrModerator(permissions.BasePermission):
+    """Доступ только администраторам и модераторам."""
+
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and (
+            request.user.is_admin or request.user.is_moderator
+        )
+
+
 class IsAdminOrSuperUser(permissions.BasePermission):
     """Доступ администраторам и суперпользователям."""
 
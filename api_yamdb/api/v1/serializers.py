@@ -1,6 +1,22 @@
+from django.contrib.auth import get_user_model
 from rest_framework import serializers
 
-from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.models import (
+    Category, Comment, Genre, Review, Title, Tombstone
+)
+from users.constants import MODERATION_IDS_LIMIT
+
+User = get_user_model()
+
+
+class SparseFieldsMixin:
+    """Оставляет в сериализаторе только поля из аргумента `fields`."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -19,7 +35,7 @@ class GenreSerializer(serializers.ModelSerializer):
         model = Genre
 
 
-class TitleReadSerializer(serializers.ModelSerializer):
+class TitleReadSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериализатор для чтения произведений."""
 
     genre = GenreSerializer(many=True)
@@ -27,7 +43,10 @@ class TitleReadSerializer(serializers.ModelSerializer):
     rating = serializers.IntegerField(read_only=True, default=0)
 
     class Meta:
-        fields = '__all__'
+        fields = (
+            'id', 'name', 'year', 'rating', 'description', 'genre',
+            'category', 'updated_at'
+        )
         model = Title
 
 
@@ -53,6 +72,25 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         return TitleReadSerializer(instance).data
 
 
+class TitleBulkItemSerializer(serializers.ModelSerializer):
+    """
+    Сериализатор элемента пакетной записи произведений.
+
+    Слаги только проверяются на формат: их наличие в базе проверяется
+    одним запросом на весь пакет.
+    """
+
+    id = serializers.IntegerField(required=False)
+    genre = serializers.ListField(
+        child=serializers.SlugField(), allow_empty=False
+    )
+    category = serializers.SlugField()
+
+    class Meta:
+        fields = ('id', 'name', 'year', 'description', 'genre', 'category')
+        model = Title
+
+
 class ReviewSerializer(serializers.ModelSerializer):
     """Сериализатор для отзывов."""
 
@@ -60,17 +98,30 @@ class ReviewSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Review
-        fields = ('id', 'text', 'author', 'score', 'pub_date')
+        fields = (
+            'id', 'text', 'author', 'score', 'pub_date', 'updated_at',
+            'comment_count'
+        )
 
-    def validate(self, attrs):
-        request = self.context['request']
-        if request.method == 'POST' and Review.objects.filter(
-                author=self.context['request'].user,
-                title=self.context['request'].parser_context['kwargs']
-                ['title_id']
-        ).exists():
-            raise serializers.ValidationError('Отзыв уже оставлен')
-        return attrs
+
+class UserReviewSerializer(ReviewSerializer):
+    """Сериализатор отзыва в ленте пользователя."""
+
+    title = serializers.PrimaryKeyRelatedField(read_only=True)
+
+    class Meta(ReviewSerializer.Meta):
+        fields = ReviewSerializer.Meta.fields + ('title',)
+
+
+class TitleWithReviewsSerializer(TitleReadSerializer):
+    """Сериализатор произведения с последними отзывами."""
+
+    reviews = ReviewSerializer(
+        many=True, read_only=True, source='latest_reviews'
+    )
+
+    class Meta(TitleReadSerializer.Meta):
+        fields = TitleReadSerializer.Meta.fields + ('reviews',)
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -80,4 +131,49 @@ class CommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Comment
-        fields = ('id', 'text', 'author', 'pub_date')
+        fields = ('id', 'text', 'author', 'pub_date', 'updated_at')
+
+
+class TitleCommentSerializer(CommentSerializer):
+    """Сериализатор комментария в ленте произведения."""
+
+    review = serializers.PrimaryKeyRelatedField(read_only=True)
+
+    class Meta(CommentSerializer.Meta):
+        fields = CommentSerializer.Meta.fields + ('review',)
+
+
+class ModerationDeleteSerializer(serializers.Serializer):
+    """Условие массового удаления: список id или автор."""
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=MODERATION_IDS_LIMIT,
+        required=False
+    )
+    author = serializers.SlugRelatedField(
+        queryset=User.objects.all(), slug_field='username', required=False
+    )
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('author' in attrs):
+            raise serializers.ValidationError(
+                'Укажите либо список id, либо автора.'
+            )
+        return attrs
+
+    def filter(self, queryset):
+        if 'ids' in self.validated_data:
+            return queryset.filter(pk__in=self.validated_data['ids'])
+        return queryset.filter(author=self.validated_data['author'])
+
+
+class TombstoneSerializer(serializers.ModelSerializer):
+    """Сериализатор записи об удалённом объекте."""
+
+    id = serializers.IntegerField(source='object_id')
+
+    class Meta:
+        fields = ('id', 'deleted_at')
+        model = Tombstone
@@ -1,23 +1,58 @@
-from django.db.models import Avg
-from django.shortcuts import get_object_or_404
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.http import Http404
+from django.utils.functional import cached_property
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, mixins, viewsets
+from rest_framework import filters, mixins, serializers, viewsets
+from rest_framework.exceptions import NotAuthenticated
+from rest_framework.decorators import action
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
-from api.v1.filters import TitleFilter
+from api.cache import make_key
+from api.v1.bulk import save_titles
+from api.v1.facets import FACETS, get_facets
+from api.v1.filters import (
+    TitleFilter, TitleIdsFilter, TitleSearchFilter, UpdatedSinceFilter
+)
+from api.v1.mixins import (
+    BackgroundDestroyMixin, CachedListMixin, ConditionalListMixin,
+    ConditionalRetrieveMixin, DeltaSyncMixin, SparseFieldsetMixin
+)
+from api.v1.pagination import KeysetPagination, PageNumberOrKeysetPagination
 from api.v1.permissions import (
     IsAdminModeratorAuthorOrReadOnly,
+    IsAdminOrModerator,
     IsAdminOrReadOnly
 )
 from api.v1.serializers import (
-    CategorySerializer, CommentSerializer, GenreSerializer, ReviewSerializer,
-    TitleReadSerializer, TitleWriteSerializer
+    CategorySerializer, CommentSerializer, GenreSerializer,
+    ModerationDeleteSerializer, ReviewSerializer,
+    TitleCommentSerializer, TitleReadSerializer, TitleWithReviewsSerializer,
+    TitleWriteSerializer, UserReviewSerializer
+)
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.moderation import (
+    delete_comments, delete_reviews, get_deleted_counts
 )
-from reviews.models import Category, Genre, Review, Title
+from reviews.signals import (
+    change_title_rating, collect_tombstones, suspend_aggregates
+)
+from users.constants import (
+    BULK_TITLES_LIMIT, EMBEDDED_REVIEWS_LIMIT, TOP_TITLES_LIMIT
+)
+
+User = get_user_model()
 
 
 class GenreCategoryViewSet(
+    ConditionalListMixin,
+    CachedListMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.DestroyModelMixin,
@@ -37,6 +72,8 @@ class CategoryViewSet(GenreCategoryViewSet):
 
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    list_cache_scopes = ('categories',)
+    validator_scopes = ('categories',)
 
 
 class GenreViewSet(GenreCategoryViewSet):
@@ -44,73 +81,510 @@ class GenreViewSet(GenreCategoryViewSet):
 
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    list_cache_scopes = ('genres',)
+    validator_scopes = ('genres',)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    CachedListMixin,
+    SparseFieldsetMixin,
+    DeltaSyncMixin,
+    BackgroundDestroyMixin,
+    viewsets.ModelViewSet
+):
     """Вьюсет для произведений."""
 
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    ).order_by('name')
-    filter_backends = (DjangoFilterBackend, filters.OrderingFilter)
+    queryset = Title.objects.visible().order_by('name')
+    filter_backends = (
+        DjangoFilterBackend,
+        TitleSearchFilter,
+        UpdatedSinceFilter,
+        filters.OrderingFilter,
+        TitleIdsFilter,
+    )
     filterset_class = TitleFilter
-    pagination_class = PageNumberPagination
+    pagination_class = PageNumberOrKeysetPagination
+    keyset_ordering = ('name', 'id')
+    list_cache_scopes = ('titles', 'genres', 'categories', 'ratings')
     http_method_names = ('get', 'post', 'patch', 'delete')
     permission_classes = (IsAdminOrReadOnly,)
-    ordering_fields = ('id', 'name', 'year')
+    ordering_fields = ('id', 'name', 'year', 'rating')
+    sparse_fieldset_actions = ('list', 'retrieve', 'top')
+    facets_ignored_params = ('page', 'cursor', 'ordering', 'fields')
+    include_query_param = 'include'
+
+    def includes_reviews(self):
+        """Запрошены ли последние отзывы параметром `include`."""
+        value = self.request.query_params.get(self.include_query_param)
+        if self.action not in self.sparse_fieldset_actions or not value:
+            return False
+        includes = set(value.split(','))
+        if includes - {'reviews'}:
+            raise serializers.ValidationError({self.include_query_param: [
+                f'Неизвестное значение: {name}.'
+                for name in sorted(includes - {'reviews'})
+            ]})
+        return True
+
+    def loads_latest_reviews(self):
+        """Нужно ли загружать последние отзывы для ответа."""
+        fields = self.get_requested_fields()
+        return self.includes_reviews() and (
+            fields is None or 'reviews' in fields
+        )
+
+    @staticmethod
+    def get_latest_reviews(title_ids):
+        """
+        Не больше EMBEDDED_REVIEWS_LIMIT последних отзывов на произведение.
+
+        Для каждого произведения отзывы выбираются своим подзапросом с
+        LIMIT по индексу (title, pub_date, id), поэтому из БД читаются
+        только попадающие в ответ отзывы.
+        """
+        condition = Q()
+        for title_id in title_ids:
+            condition |= Q(id__in=Review.objects.filter(
+                title_id=title_id
+            ).order_by('-pub_date', '-id').values('id')[
+                :EMBEDDED_REVIEWS_LIMIT
+            ])
+        return Review.objects.filter(condition).select_related(
+            'author'
+        ).order_by('-pub_date', '-id')
+
+    def attach_latest_reviews(self, titles):
+        """Сохранить последние отзывы в `latest_reviews` произведений."""
+        if len(titles) == 1:
+            title, = titles
+            title.latest_reviews = list(
+                title.reviews.select_related('author').order_by(
+                    '-pub_date', '-id'
+                )[:EMBEDDED_REVIEWS_LIMIT]
+            )
+            return
+        latest = {title.pk: [] for title in titles}
+        if latest:
+            for review in self.get_latest_reviews(latest):
+                latest[review.title_id].append(review)
+        for title in titles:
+            title.latest_reviews = latest[title.pk]
+
+    def get_queryset(self):
+        """
+        Произведения с загрузкой только запрошенных полей.
+
+        Без параметра `fields` загружаются все поля, категория и жанры.
+        Поля ключа пагинации по курсору загружаются всегда.
+        """
+        queryset = super().get_queryset()
+        fields = self.get_requested_fields()
+        if fields is None or 'category' in fields:
+            queryset = queryset.select_related('category')
+        if fields is None or 'genre' in fields:
+            queryset = queryset.prefetch_related('genre')
+        if fields is not None:
+            queryset = queryset.only(
+                'id', *self.get_keyset_ordering(),
+                *(fields - {'genre', 'reviews'})
+            )
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        """Последние отзывы загружаются для уже выбранных произведений."""
+        if args and self.loads_latest_reviews():
+            many = kwargs.get('many', False)
+            titles = list(args[0]) if many else [args[0]]
+            self.attach_latest_reviews(titles)
+            args = (titles if many else args[0], *args[1:])
+        return super().get_serializer(*args, **kwargs)
+
+    def paginate_queryset(self, queryset):
+        """Выборка по списку id возвращается без пагинации."""
+        if TitleIdsFilter.ids_param in self.request.query_params:
+            return None
+        return super().paginate_queryset(queryset)
+
+    def get_count_cache_scopes(self):
+        if self.is_sync_request():
+            return None
+        return ('titles', 'genres', 'categories')
+
+    def get_list_cache_scopes(self):
+        if self.includes_reviews():
+            return (
+                *self.list_cache_scopes, 'reviews', 'comment-counts', 'users'
+            )
+        return self.list_cache_scopes
+
+    def get_validator_scopes(self):
+        if self.action == 'retrieve':
+            scopes = (f'title:{self.kwargs["pk"]}', 'genres', 'categories')
+            if self.includes_reviews():
+                scopes += (
+                    f'title:{self.kwargs["pk"]}:reviews',
+                    'comment-counts',
+                    'users',
+                )
+            return scopes
+        return self.get_list_cache_scopes()
 
     def get_serializer_class(self):
         if self.action in ['create', 'partial_update']:
             return TitleWriteSerializer
+        if self.includes_reviews():
+            return TitleWithReviewsSerializer
         return TitleReadSerializer
 
+    @action(detail=False, url_path='top')
+    def top(self, request):
+        """Произведения с наибольшим рейтингом с учётом фильтров."""
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            review_count__gte=settings.TOP_TITLES_MIN_REVIEWS
+        ).order_by('-rating', '-review_count')[:TOP_TITLES_LIMIT]
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """Пакетное создание и частичное обновление произведений."""
+        if not isinstance(request.data, list) or not request.data:
+            raise serializers.ValidationError(
+                'Ожидается непустой список произведений.'
+            )
+        if len(request.data) > BULK_TITLES_LIMIT:
+            raise serializers.ValidationError(
+                f'Не больше {BULK_TITLES_LIMIT} произведений за один запрос.'
+            )
+        return Response(save_titles(request.data))
+
+    @action(detail=False, url_path='facets')
+    def facets(self, request):
+        """
+        Количество произведений по жанрам, категориям и десятилетиям.
+
+        Учитывает те же фильтры, что и список произведений. Ответ
+        кешируется по набору фильтров до изменения произведений, жанров
+        или категорий.
+        """
+        names = request.query_params.get('facets')
+        names = names.split(',') if names else list(FACETS)
+        unknown = set(names) - set(FACETS)
+        if unknown:
+            raise serializers.ValidationError({'facets': [
+                f'Неизвестная группа: {name}.' for name in sorted(unknown)
+            ]})
+        key = make_key(
+            'facets', request, ('titles', 'genres', 'categories'),
+            exclude=self.facets_ignored_params
+        )
+        data = cache.get(key)
+        if data is None:
+            data = get_facets(
+                self.filter_queryset(Title.objects.visible()), names
+            )
+            cache.set(key, data, settings.LIST_CACHE_TIMEOUT)
+        return Response(data)
+
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class TitleNestedMixin:
+    """Вложенные в произведение вьюсеты."""
+
+    @cached_property
+    def title_id(self):
+        """
+        Id произведения из адреса.
+
+        Существование произведения проверяется один раз за запрос без
+        загрузки его полей.
+        """
+        title_id = int(self.kwargs['title_id'])
+        if not Title.objects.visible().filter(pk=title_id).exists():
+            raise Http404('Произведение не найдено.')
+        return title_id
+
+
+class ReviewViewSet(
+    TitleNestedMixin,
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    DeltaSyncMixin,
+    viewsets.ModelViewSet
+):
     """Вьюсет для отзывов."""
 
     serializer_class = ReviewSerializer
+    filter_backends = (UpdatedSinceFilter,)
+    pagination_class = PageNumberOrKeysetPagination
+    keyset_ordering = ('pub_date', 'id')
     http_method_names = ('get', 'post', 'patch', 'delete')
     permission_classes = (
         IsAdminModeratorAuthorOrReadOnly, IsAuthenticatedOrReadOnly
     )
 
-    def get_title(self):
-        """Получаем произведение для отзыва."""
-        title_id = self.kwargs.get('title_id')
-        return get_object_or_404(Title, id=title_id)
-
     def get_queryset(self):
-        """Получение queryset для отзывов конкретного произведения."""
-        title = self.get_title()
-        return title.reviews.all()
+        """
+        Получение queryset для отзывов конкретного произведения.
+
+        Для отдельного отзыва отдельная проверка произведения не нужна:
+        отзыв ищется сразу по id произведения и своему id, а скрытое
+        до удаления произведение отсекается в том же запросе. Автор
+        загружается в том же запросе.
+        """
+        reviews = Review.objects.select_related('author')
+        if self.detail:
+            return reviews.filter(
+                title_id=self.kwargs['title_id'],
+                title__deletion_pending=False
+            )
+        return reviews.filter(title_id=self.title_id)
+
+    def get_count_cache_scopes(self):
+        if self.is_sync_request():
+            return None
+        return (f'title:{self.kwargs.get("title_id")}:reviews',)
+
+    def get_tombstone_parent_id(self):
+        return self.title_id
+
+    def get_validator_scopes(self):
+        return (
+            f'title:{self.kwargs.get("title_id")}:reviews',
+            'comment-counts',
+            'users',
+        )
 
     def perform_create(self, serializer):
-        """Сохранение отзыва с автором и произведением."""
-        title = self.get_title()
-        serializer.save(author=self.request.user, title=title)
+        """
+        Сохранение отзыва с автором и произведением.
 
+        Повторный отзыв отсекает ограничение unique_review: отдельная
+        проверка перед записью стоила бы запроса и не защищала бы от
+        одновременных запросов.
+        """
+        try:
+            with transaction.atomic():
+                serializer.save(
+                    author=self.request.user, title_id=self.title_id
+                )
+        except IntegrityError:
+            if not Review.objects.filter(
+                author=self.request.user, title_id=self.title_id
+            ).exists():
+                raise
+            raise serializers.ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: ['Отзыв уже оставлен']}
+            )
 
-class CommentViewSet(viewsets.ModelViewSet):
+    def perform_destroy(self, instance):
+        """
+        Удаление отзыва с комментариями.
+
+        Число комментариев удаляемого отзыва не обновляется по каждому
+        комментарию, а рейтинг произведения меняется одним запросом.
+        """
+        with transaction.atomic(), collect_tombstones():
+            with suspend_aggregates():
+                instance.delete()
+            change_title_rating(instance.title_id, -instance.score, -1)
+
+
+class CommentViewSet(
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    DeltaSyncMixin,
+    viewsets.ModelViewSet
+):
     """Вьюсет для комментариев."""
 
     serializer_class = CommentSerializer
+    filter_backends = (UpdatedSinceFilter,)
+    pagination_class = PageNumberOrKeysetPagination
+    keyset_ordering = ('pub_date', 'id')
     http_method_names = ('get', 'post', 'patch', 'delete')
     permission_classes = (
         IsAdminModeratorAuthorOrReadOnly, IsAuthenticatedOrReadOnly
     )
 
-    def get_review(self):
-        """Получаем отзыв для комментария."""
-        review_id = self.kwargs.get('review_id')
-        title_id = self.kwargs.get('title_id')
-        return get_object_or_404(Review, id=review_id, title__id=title_id)
+    @cached_property
+    def review_id(self):
+        """
+        Id отзыва из адреса.
+
+        Отзыв должен относиться к произведению из адреса; это
+        проверяется один раз за запрос без загрузки полей отзыва.
+        """
+        review_id = int(self.kwargs['review_id'])
+        if not Review.objects.filter(
+            pk=review_id, title_id=self.kwargs['title_id'],
+            title__deletion_pending=False
+        ).exists():
+            raise Http404('Отзыв не найден.')
+        return review_id
 
     def get_queryset(self):
-        """Получение queryset для комментариев конкретного отзыва."""
-        review = self.get_review()
-        return review.comments.all()
+        """
+        Получение queryset для комментариев конкретного отзыва.
+
+        Для отдельного комментария отзыв проверяется в том же запросе.
+        Автор загружается вместе с комментариями.
+        """
+        comments = Comment.objects.select_related('author')
+        if self.detail:
+            return comments.filter(
+                review_id=self.kwargs['review_id'],
+                review__title_id=self.kwargs['title_id'],
+                review__title__deletion_pending=False
+            )
+        return comments.filter(review_id=self.review_id)
+
+    def get_count_cache_scopes(self):
+        if self.is_sync_request():
+            return None
+        return (f'review:{self.kwargs.get("review_id")}:comments',)
+
+    def get_tombstone_parent_id(self):
+        return self.review_id
+
+    def get_validator_scopes(self):
+        return (
+            f'review:{self.kwargs.get("review_id")}:comments',
+            f'title:{self.kwargs.get("title_id")}',
+            'users',
+        )
 
     def perform_create(self, serializer):
         """Сохранение комментария с автором и отзывом."""
-        review = self.get_review()
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(
+            author=self.request.user, review_id=self.review_id,
+            title_id=self.kwargs['title_id']
+        )
+
+
+class TitleCommentViewSet(
+    TitleNestedMixin,
+    ConditionalListMixin,
+    mixins.ListModelMixin,
+    viewsets.GenericViewSet
+):
+    """
+    Лента комментариев ко всем отзывам произведения.
+
+    Комментарии выбираются одним запросом вместе с id отзыва и автором
+    по индексу (title, pub_date, id) и отдаются только с пагинацией по
+    курсору.
+    """
+
+    serializer_class = TitleCommentSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ('pub_date', 'id')
+    validator_scopes = ('comments', 'users')
+
+    def get_queryset(self):
+        return Comment.objects.filter(
+            title_id=self.title_id
+        ).select_related('author')
+
+
+class ModerationViewSet(viewsets.GenericViewSet):
+    """
+    Массовое удаление отзывов и комментариев модераторами.
+
+    Модератор может удалить любой отзыв и комментарий, поэтому права
+    проверяются один раз по роли, а не для каждого объекта.
+    """
+
+    serializer_class = ModerationDeleteSerializer
+    permission_classes = (IsAdminOrModerator,)
+
+    def bulk_delete(self, request, queryset, delete):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        deleted = delete(serializer.filter(queryset))
+        return Response(get_deleted_counts(deleted))
+
+    @action(detail=False, methods=['post'], url_path='reviews/delete')
+    def delete_reviews(self, request):
+        """Удалить отзывы по списку id или автору."""
+        return self.bulk_delete(request, Review.objects.all(), delete_reviews)
+
+    @action(detail=False, methods=['post'], url_path='comments/delete')
+    def delete_comments(self, request):
+        """Удалить комментарии по списку id или автору."""
+        return self.bulk_delete(
+            request, Comment.objects.all(), delete_comments
+        )
+
+
+class AuthorNestedMixin:
+    """
+    Вложенные в пользователя вьюсеты.
+
+    Вместо имени пользователя в адресе можно указать `me`.
+    """
+
+    @cached_property
+    def author_id(self):
+        """Id пользователя из адреса, определяется один раз за запрос."""
+        username = self.kwargs['username']
+        if username == 'me':
+            if not self.request.user.is_authenticated:
+                raise NotAuthenticated()
+            return self.request.user.id
+        author_id = User.objects.filter(
+            username=username, deletion_pending=False
+        ).values_list('id', flat=True).first()
+        if author_id is None:
+            raise Http404('Пользователь не найден.')
+        return author_id
+
+    def get_validator_scopes(self):
+        return (*self.validator_scopes, f'author:{self.author_id}')
+
+
+class UserReviewViewSet(
+    AuthorNestedMixin,
+    ConditionalListMixin,
+    mixins.ListModelMixin,
+    viewsets.GenericViewSet
+):
+    """
+    Отзывы пользователя от новых к старым.
+
+    Страницы выбираются по курсору и индексу (author, pub_date, id).
+    """
+
+    serializer_class = UserReviewSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-pub_date', '-id')
+    validator_scopes = ('reviews', 'comment-counts', 'users')
+
+    def get_queryset(self):
+        return Review.objects.filter(
+            author_id=self.author_id, title__deletion_pending=False
+        ).select_related('author')
+
+
+class UserCommentViewSet(
+    AuthorNestedMixin,
+    ConditionalListMixin,
+    mixins.ListModelMixin,
+    viewsets.GenericViewSet
+):
+    """
+    Комментарии пользователя от новых к старым.
+
+    Страницы выбираются по курсору и индексу (author, pub_date, id).
+    """
+
+    serializer_class = TitleCommentSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-pub_date', '-id')
+    validator_scopes = ('comments', 'users')
+
+    def get_queryset(self):
+        return Comment.objects.filter(
+            author_id=self.author_id, title__deletion_pending=False
+        ).select_related('author')
@@ -1,3 +1,4 @@
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
@@ -118,6 +119,44 @@ REST_FRAMEWORK = {
     ),
 }
 
+# Версии областей кеша (api/cache.py) хранятся в самом кеше, поэтому он
+# должен быть общим для всех процессов: воркеров сервера и команд
+# process_deletions, recalculate_ratings и recalculate_comment_counts.
+# Иначе изменения из другого процесса не сбрасывают кеш списков и ответы
+# 304. Файловый кеш общий для процессов одного сервера, как и база
+# SQLite; при нескольких серверах нужен Memcached или Redis.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': Path(tempfile.gettempdir()) / 'api_yamdb_cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    }
+}
+
+# Кеширование ответов на запросы списков
+
+LIST_CACHE_TIMEOUT = 60 * 60
+
+# Кеширование количества объектов в постраничной пагинации
+
+PAGINATION_COUNT_CACHE_TIMEOUT = 60 * 60
+
+PAGINATION_COUNT_ESTIMATE_THRESHOLD = 10000
+
+PAGINATION_COUNT_ESTIMATE_TIMEOUT = 60 * 10
+
+# Минимальное количество отзывов для попадания в топ произведений
+
+TOP_TITLES_MIN_REVIEWS = 5
+
+# Удаление произведений и пользователей с отзывами и комментариями в фоне:
+# объект сразу скрывается, а остальное удаляет команда process_deletions
+
+CASCADE_DELETE_IN_BACKGROUND = False
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'AUTH_HEADER_TYPES': ('Bearer',),
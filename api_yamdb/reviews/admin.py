@@ -1,6 +1,8 @@
 from django.contrib import admin
 
-from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.models import (
+    CascadeDeletion, Category, Comment, Genre, Review, Title
+)
 from users.constants import ADMIN_PAGE_TEXT_LIMIT
 
 
@@ -56,3 +58,31 @@ class CommentAdmin(admin.ModelAdmin):
     @admin.display(description='Текст комментария')
     def comment_text_view(self, obj):
         return f'{obj.text[:ADMIN_PAGE_TEXT_LIMIT]}''...'
+
+
+@admin.register(CascadeDeletion)
+class CascadeDeletionAdmin(admin.ModelAdmin):
+    list_display = (
+        'object_repr',
+        'model_name',
+        'status',
+        'get_reviews_progress',
+        'get_comments_progress',
+        'created_at',
+        'finished_at'
+    )
+    list_filter = ('status', 'model_name')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description='Отзывы')
+    def get_reviews_progress(self, obj):
+        return f'{obj.reviews_deleted} из {obj.reviews_total}'
+
+    @admin.display(description='Комментарии')
+    def get_comments_progress(self, obj):
+        return f'{obj.comments_deleted} из {obj.comments_total}'
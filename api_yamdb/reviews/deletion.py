@@ -0,0 +1,201 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, Q, Sum
+from django.utils import timezone
+
+from reviews.models import (
+    CascadeDeletion, Comment, DeletionStatus, Review, Title, Tombstone
+)
+from reviews.moderation import (
+    delete_in_batches, get_deleted_counts, recalculate_comment_counts
+)
+from reviews.signals import (
+    collect_tombstones, deletion_scheduled, recalculate_title_ratings,
+    suspend_aggregates
+)
+from users.constants import MAX_NAME_LENGTH, MODERATION_BATCH_SIZE
+
+User = get_user_model()
+
+
+def skip_recalculation(parent_ids):
+    """Родитель удаляется целиком, поэтому его агрегаты не нужны."""
+
+
+class TitleCascade:
+    """Каскадное удаление произведения."""
+
+    model = Title
+
+    @staticmethod
+    def hide(title):
+        """
+        Скрыть произведение из API.
+
+        Для клиентов произведение удалено уже сейчас, поэтому запись об
+        удалении сохраняется при постановке в очередь.
+        """
+        Title.objects.filter(pk=title.pk).update(deletion_pending=True)
+        Tombstone.objects.create(
+            model_name=Title._meta.model_name, object_id=title.pk
+        )
+
+    @staticmethod
+    def count(title):
+        comments_total = Review.objects.filter(title=title).aggregate(
+            total=Sum('comment_count')
+        )['total']
+        return title.review_count, comments_total or 0
+
+    @staticmethod
+    def get_steps(title_id):
+        return (
+            (
+                Comment.objects.filter(title_id=title_id),
+                'review_id', skip_recalculation
+            ),
+            (
+                Review.objects.filter(title_id=title_id),
+                'title_id', skip_recalculation
+            ),
+        )
+
+
+class UserCascade:
+    """Каскадное удаление пользователя."""
+
+    model = User
+
+    @staticmethod
+    def hide(user):
+        """Скрыть пользователя из API и запретить ему вход."""
+        User.objects.filter(pk=user.pk).update(
+            deletion_pending=True, is_active=False
+        )
+
+    @staticmethod
+    def count(user):
+        return (
+            Review.objects.filter(author=user).count(),
+            Comment.objects.filter(
+                Q(author=user) | Q(review__author=user)
+            ).count(),
+        )
+
+    @staticmethod
+    def get_steps(user_id):
+        return (
+            (
+                Comment.objects.filter(author_id=user_id),
+                'review_id', recalculate_comment_counts
+            ),
+            (
+                Comment.objects.filter(review__author_id=user_id),
+                'review_id', skip_recalculation
+            ),
+            (
+                Review.objects.filter(author_id=user_id),
+                'title_id', recalculate_title_ratings
+            ),
+        )
+
+
+CASCADES = {
+    cascade.model._meta.model_name: cascade
+    for cascade in (TitleCascade, UserCascade)
+}
+
+
+def schedule_deletion(obj):
+    """
+    Скрыть произведение или пользователя и поставить удаление в очередь.
+
+    Отзывы и комментарии объекта остаются в базе, пока их не удалит
+    process_deletions.
+    """
+    model_name = obj._meta.model_name
+    cascade = CASCADES[model_name]
+    with transaction.atomic():
+        cascade.hide(obj)
+        reviews_total, comments_total = cascade.count(obj)
+        task = CascadeDeletion.objects.create(
+            model_name=model_name,
+            object_id=obj.pk,
+            object_repr=str(obj)[:MAX_NAME_LENGTH],
+            reviews_total=reviews_total,
+            comments_total=comments_total,
+        )
+    deletion_scheduled.send(sender=cascade.model, instance=obj)
+    return task
+
+
+def delete_now(obj):
+    """
+    Удалить произведение или пользователя с каскадом в одной транзакции.
+
+    Рейтинги и счётчики комментариев не меняются по каждой удалённой
+    записи: уцелевшие родители пересчитываются по одному разу, а записи
+    об удалении сохраняются одним запросом.
+    """
+    cascade = CASCADES[obj._meta.model_name]
+    with transaction.atomic():
+        recalculations = [
+            (recalculate, set(queryset.values_list(parent_field, flat=True)))
+            for queryset, parent_field, recalculate
+            in cascade.get_steps(obj.pk)
+            if recalculate is not skip_recalculation
+        ]
+        with suspend_aggregates(), collect_tombstones():
+            obj.delete()
+        for recalculate, parent_ids in recalculations:
+            recalculate(parent_ids)
+
+
+def record_progress(task, counts):
+    deleted = get_deleted_counts(counts)
+    CascadeDeletion.objects.filter(pk=task.pk).update(
+        reviews_deleted=F('reviews_deleted') + deleted['reviews'],
+        comments_deleted=F('comments_deleted') + deleted['comments'],
+    )
+
+
+def process_deletion(task, batch_size=MODERATION_BATCH_SIZE):
+    """
+    Удалить отзывы и комментарии объекта пачками, а затем сам объект.
+
+    Каждая пачка удаляется в своей транзакции, поэтому блокировка
+    записи SQLite не удерживается надолго. Прерванное удаление можно
+    запустить повторно: оно продолжится с оставшихся записей.
+    """
+    cascade = CASCADES[task.model_name]
+    CascadeDeletion.objects.filter(pk=task.pk).update(
+        status=DeletionStatus.RUNNING
+    )
+    for queryset, parent_field, recalculate in cascade.get_steps(
+        task.object_id
+    ):
+        delete_in_batches(
+            queryset, parent_field, recalculate, batch_size,
+            on_batch=partial(record_progress, task)
+        )
+    with transaction.atomic():
+        with collect_tombstones() as tombstones:
+            cascade.model.objects.filter(pk=task.object_id).delete()
+            # Удаление самого объекта записано при постановке в очередь.
+            tombstones[:] = [
+                tombstone for tombstone in tombstones
+                if tombstone.model_name != task.model_name
+            ]
+        CascadeDeletion.objects.filter(pk=task.pk).update(
+            status=DeletionStatus.DONE, finished_at=timezone.now()
+        )
+
+
+def process_deletions(batch_size=MODERATION_BATCH_SIZE):
+    """Выполнить все незавершённые удаления в порядке постановки."""
+    tasks = list(CascadeDeletion.objects.exclude(status=DeletionStatus.DONE))
+    for task in tasks:
+        process_deletion(task, batch_size)
+    return len(tasks)
@@ -1,6 +1,7 @@
 import csv
 import os
 
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
 
 from reviews.models import Category, Comment, Genre, Review, Title, User
@@ -39,6 +40,8 @@ class Command(BaseCommand):
                 )
 
         load_title_genre(self)
+        call_command('recalculate_ratings')
+        call_command('recalculate_comment_counts')
 
 
 def load_title_genre(self):
@@ -65,11 +68,16 @@ def load_title_genre(self):
 
 def csv_serializer(csv_data, model, self):
     objs = []
+    review_titles = dict(
+        Review.objects.values_list('id', 'title_id')
+    ) if model is Comment else {}
     for row_number, row in enumerate(csv_data, start=1):
         for field in FOREIGN_KEY_FIELDS:
             if field in row:
                 row[f'{field}_id'] = row[field]
                 del row[field]
+        if model is Comment:
+            row['title_id'] = review_titles.get(int(row['review_id']))
         objs.append(model(**row))
     model.objects.bulk_create(objs, ignore_conflicts=True)
     self.stdout.write(
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.deletion import process_deletions
+from users.constants import MODERATION_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = 'Фоновое удаление произведений и пользователей из очереди'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=MODERATION_BATCH_SIZE,
+            help='Число записей, удаляемых в одной транзакции'
+        )
+        parser.add_argument(
+            '--interval', type=float,
+            help='Проверять очередь с этим интервалом в секундах, '
+                 'не завершая работу'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = process_deletions(options['batch_size'])
+            if processed:
+                self.stdout.write(
+                    self.style.SUCCESS(f'Выполнено удалений: {processed}')
+                )
+            if options['interval'] is None:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from reviews.search import (
+    ensure_search_triggers, is_search_available, rebuild_search_index
+)
+
+
+class Command(BaseCommand):
+    help = 'Пересборка полнотекстового индекса произведений'
+
+    def handle(self, *args, **kwargs):
+        if not is_search_available(connection):
+            raise CommandError(
+                'Полнотекстовый индекс доступен только для SQLite после '
+                'применения миграций'
+            )
+        if not ensure_search_triggers(connection):
+            rebuild_search_index(connection)
+        self.stdout.write(
+            self.style.SUCCESS('Полнотекстовый индекс произведений пересобран')
+        )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from reviews.models import Review
+from reviews.signals import review_comment_count_changed
+
+
+class Command(BaseCommand):
+    help = 'Пересчёт количества комментариев к отзывам'
+
+    def handle(self, *args, **kwargs):
+        updated = Review.objects.recalculate_comment_counts()
+        review_comment_count_changed.send(
+            sender=Review,
+            review_ids=Review.objects.values_list('pk', flat=True)
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Количество комментариев пересчитано для {updated} отзывов'
+            )
+        )
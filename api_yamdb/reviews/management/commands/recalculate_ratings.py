@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from reviews.models import Title
+from reviews.signals import title_rating_changed
+
+
+class Command(BaseCommand):
+    help = 'Пересчёт рейтингов произведений по отзывам'
+
+    def handle(self, *args, **kwargs):
+        updated = Title.objects.recalculate_ratings()
+        title_rating_changed.send(
+            sender=Title, title_ids=Title.objects.values_list('pk', flat=True)
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Рейтинги пересчитаны для {updated} произведений'
+            )
+        )
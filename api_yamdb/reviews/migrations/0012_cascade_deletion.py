@@ -0,0 +1,39 @@
+# Generated by Django 3.2 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0011_updated_at_tombstone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='deletion_pending',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Ожидает удаления'),
+        ),
+        migrations.CreateModel(
+            name='CascadeDeletion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_name', models.CharField(max_length=50, verbose_name='Модель')),
+                ('object_id', models.PositiveIntegerField(verbose_name='Id объекта')),
+                ('object_repr', models.CharField(max_length=256, verbose_name='Объект')),
+                ('status', models.CharField(choices=[('pending', 'В очереди'), ('running', 'Выполняется'), ('done', 'Завершено')], default='pending', max_length=7, verbose_name='Состояние')),
+                ('reviews_total', models.PositiveIntegerField(default=0, verbose_name='Отзывов к удалению')),
+                ('comments_total', models.PositiveIntegerField(default=0, verbose_name='Комментариев к удалению')),
+                ('reviews_deleted', models.PositiveIntegerField(default=0, verbose_name='Удалено отзывов')),
+                ('comments_deleted', models.PositiveIntegerField(default=0, verbose_name='Удалено комментариев')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата постановки в очередь')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Дата завершения')),
+            ],
+            options={
+                'verbose_name': 'Фоновое удаление',
+                'verbose_name_plural': 'Фоновые удаления',
+                'ordering': ('created_at', 'id'),
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.2 on 2026-10-18 12:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_comment_titles(apps, schema_editor):
+    Comment = apps.get_model('reviews', 'Comment')
+    Review = apps.get_model('reviews', 'Review')
+    Comment.objects.update(title_id=Subquery(
+        Review.objects.filter(pk=OuterRef('review_id')).values('title_id')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0012_cascade_deletion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='title',
+            field=models.ForeignKey(db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='reviews.title', verbose_name='Произведение'),
+        ),
+        migrations.RunPython(fill_comment_titles, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='comment',
+            name='title',
+            field=models.ForeignKey(db_index=False, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='reviews.title', verbose_name='Произведение'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['title', 'pub_date', 'id'], name='comment_title_pub_date_idx'),
+        ),
+    ]
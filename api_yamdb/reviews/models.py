@@ -1,6 +1,11 @@
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import models, transaction
+from django.db.models import (
+    Case, Count, F, FloatField, OuterRef, Subquery, Sum, Value, When
+)
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
 
 from users.constants import (
     MAX_NAME_LENGTH, MAX_SCORE, MIN_SCORE, TEXT_PREVIEW_LENGTH
@@ -43,6 +48,52 @@ class Category(NameSlugModel):
         verbose_name_plural = 'Категории'
 
 
+class TitleQuerySet(models.QuerySet):
+    """QuerySet произведений."""
+
+    def visible(self):
+        """Произведения, кроме поставленных в очередь на удаление."""
+        return self.filter(deletion_pending=False)
+
+    def change_ratings(self, score_delta, count_delta):
+        """Изменить сумму оценок и число отзывов на заданные величины."""
+        new_sum = F('rating_sum') + score_delta
+        new_count = F('review_count') + count_delta
+        return self.update(
+            rating_sum=new_sum,
+            review_count=new_count,
+            updated_at=timezone.now(),
+            rating=Case(
+                When(review_count=-count_delta, then=Value(None)),
+                default=Cast(new_sum, FloatField()) / new_count,
+                output_field=FloatField(),
+            ),
+        )
+
+    def recalculate_ratings(self):
+        """Пересчитать сумму оценок, число отзывов и рейтинг с нуля."""
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        updated = self.update(
+            rating_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum('score')).values('total')),
+                0
+            ),
+            review_count=Coalesce(
+                Subquery(reviews.annotate(total=Count('pk')).values('total')),
+                0
+            ),
+            updated_at=timezone.now(),
+        )
+        self.update(rating=Case(
+            When(review_count=0, then=Value(None)),
+            default=Cast('rating_sum', FloatField()) / F('review_count'),
+            output_field=FloatField(),
+        ))
+        return updated
+
+
 class Title(models.Model):
     """Модель произведений."""
 
@@ -62,13 +113,52 @@ class Title(models.Model):
         verbose_name='Категория',
         on_delete=models.SET_NULL,
         null=True,
+        db_index=False,
+    )
+    rating_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок', default=0, editable=False
+    )
+    review_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов', default=0, editable=False
     )
+    rating = models.FloatField(
+        verbose_name='Рейтинг', null=True, editable=False
+    )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения', auto_now=True
+    )
+    deletion_pending = models.BooleanField(
+        verbose_name='Ожидает удаления', default=False, editable=False
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         default_related_name = 'titles'
         ordering = ('name',)
+        indexes = (
+            models.Index(fields=('name', 'id'), name='title_name_id_idx'),
+            models.Index(fields=('name', 'year'), name='title_name_year_idx'),
+            models.Index(fields=('year', 'name'), name='title_year_name_idx'),
+            models.Index(
+                fields=('category', 'name'), name='title_category_name_idx'
+            ),
+            models.Index(
+                fields=('category', 'year'), name='title_category_year_idx'
+            ),
+            models.Index(
+                fields=('rating', 'review_count'), name='title_rating_idx'
+            ),
+            models.Index(
+                fields=('category', 'rating', 'review_count'),
+                name='title_category_rating_idx'
+            ),
+            models.Index(
+                fields=('updated_at', 'id'), name='title_updated_at_idx'
+            ),
+        )
 
     def __str__(self):
         return self.name
@@ -83,12 +173,17 @@ class BaseReviewCommentModel(models.Model):
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
+        db_index=False,
         verbose_name='Автор'
     )
     pub_date = models.DateTimeField(
         verbose_name='Дата публикации',
         auto_now_add=True
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        auto_now=True
+    )
 
     class Meta:
         abstract = True
@@ -98,6 +193,32 @@ class BaseReviewCommentModel(models.Model):
         return self.text[:TEXT_PREVIEW_LENGTH]
 
 
+class ReviewQuerySet(models.QuerySet):
+    """QuerySet отзывов."""
+
+    def change_comment_counts(self, delta):
+        """Изменить число комментариев на заданную величину."""
+        return self.update(
+            comment_count=F('comment_count') + delta,
+            updated_at=timezone.now()
+        )
+
+    def recalculate_comment_counts(self):
+        """Пересчитать число комментариев с нуля."""
+        comments = Comment.objects.filter(
+            review=OuterRef('pk')
+        ).order_by().values('review')
+        return self.update(
+            comment_count=Coalesce(
+                Subquery(
+                    comments.annotate(total=Count('pk')).values('total')
+                ),
+                0
+            ),
+            updated_at=timezone.now()
+        )
+
+
 class Review(BaseReviewCommentModel):
     """Модель отзыва."""
 
@@ -108,9 +229,14 @@ class Review(BaseReviewCommentModel):
     title = models.ForeignKey(
         Title,
         on_delete=models.CASCADE,
-        db_index=True,
+        db_index=False,
         verbose_name='Произведение'
     )
+    comment_count = models.PositiveIntegerField(
+        verbose_name='Количество комментариев', default=0, editable=False
+    )
+
+    objects = ReviewQuerySet.as_manager()
 
     class Meta(BaseReviewCommentModel.Meta):
         verbose_name = 'Отзыв'
@@ -122,6 +248,25 @@ class Review(BaseReviewCommentModel):
             )
         ]
         default_related_name = 'reviews'
+        indexes = [
+            models.Index(
+                fields=['author', 'pub_date', 'id'],
+                name='review_author_pub_date_idx'
+            ),
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pub_date_idx'
+            ),
+            models.Index(
+                fields=['title', 'updated_at', 'id'],
+                name='review_title_updated_at_idx'
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        """Сохраняем отзыв и рейтинг произведения в одной транзакции."""
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
 
 class Comment(BaseReviewCommentModel):
@@ -130,10 +275,137 @@ class Comment(BaseReviewCommentModel):
     review = models.ForeignKey(
         Review,
         on_delete=models.CASCADE,
+        db_index=False,
         verbose_name='Отзыв'
     )
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        db_index=False,
+        editable=False,
+        verbose_name='Произведение'
+    )
 
     class Meta(BaseReviewCommentModel.Meta):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
+        indexes = [
+            models.Index(
+                fields=['author', 'pub_date', 'id'],
+                name='comment_author_pub_date_idx'
+            ),
+            models.Index(
+                fields=['review', 'pub_date', 'id'],
+                name='comment_review_pub_date_idx'
+            ),
+            models.Index(
+                fields=['review', 'updated_at', 'id'],
+                name='comment_review_updated_at_idx'
+            ),
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='comment_title_pub_date_idx'
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Сохраняем комментарий и счётчик комментариев в одной транзакции.
+
+        Произведение берётся из отзыва: оно хранится в комментарии для
+        ленты комментариев произведения.
+        """
+        if self.title_id is None:
+            self.title_id = self.review.title_id
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class Tombstone(models.Model):
+    """
+    Запись об удалённом произведении, отзыве или комментарии.
+
+    По таким записям клиенты узнают об удалениях без повторной загрузки
+    всего списка. Для отзыва и комментария хранится id родителя: отзыва
+    для комментария и произведения для отзыва.
+    """
+
+    model_name = models.CharField(verbose_name='Модель', max_length=50)
+    object_id = models.PositiveIntegerField(verbose_name='Id объекта')
+    parent_id = models.PositiveIntegerField(
+        verbose_name='Id родителя', null=True
+    )
+    deleted_at = models.DateTimeField(
+        verbose_name='Дата удаления', auto_now_add=True
+    )
+
+    class Meta:
+        verbose_name = 'Удалённый объект'
+        verbose_name_plural = 'Удалённые объекты'
+        ordering = ('deleted_at', 'id')
+        indexes = (
+            models.Index(
+                fields=('model_name', 'parent_id', 'deleted_at', 'id'),
+                name='tombstone_parent_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.model_name} {self.object_id}'
+
+
+class DeletionStatus(models.TextChoices):
+    """Состояния фонового удаления."""
+
+    PENDING = 'pending', 'В очереди'
+    RUNNING = 'running', 'Выполняется'
+    DONE = 'done', 'Завершено'
+
+
+class CascadeDeletion(models.Model):
+    """
+    Фоновое каскадное удаление произведения или пользователя.
+
+    Объект скрывается сразу при постановке в очередь, а его отзывы и
+    комментарии удаляет команда process_deletions. Число удалённых
+    записей обновляется после каждой пачки.
+    """
+
+    model_name = models.CharField(verbose_name='Модель', max_length=50)
+    object_id = models.PositiveIntegerField(verbose_name='Id объекта')
+    object_repr = models.CharField(
+        verbose_name='Объект', max_length=MAX_NAME_LENGTH
+    )
+    status = models.CharField(
+        verbose_name='Состояние',
+        max_length=max(len(status) for status in DeletionStatus.values),
+        choices=DeletionStatus.choices,
+        default=DeletionStatus.PENDING
+    )
+    reviews_total = models.PositiveIntegerField(
+        verbose_name='Отзывов к удалению', default=0
+    )
+    comments_total = models.PositiveIntegerField(
+        verbose_name='Комментариев к удалению', default=0
+    )
+    reviews_deleted = models.PositiveIntegerField(
+        verbose_name='Удалено отзывов', default=0
+    )
+    comments_deleted = models.PositiveIntegerField(
+        verbose_name='Удалено комментариев', default=0
+    )
+    created_at = models.DateTimeField(
+        verbose_name='Дата постановки в очередь', auto_now_add=True
+    )
+    finished_at = models.DateTimeField(
+        verbose_name='Дата завершения', null=True, blank=True
+    )
+
+    class Meta:
+        verbose_name = 'Фоновое удаление'
+        verbose_name_plural = 'Фоновые удаления'
+        ordering = ('created_at', 'id')
+
+    def __str__(self):
+        return f'{self.model_name} {self.object_repr}'
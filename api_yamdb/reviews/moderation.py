@@ -0,0 +1,67 @@
+from django.db import transaction
+
+from reviews.models import Comment, Review
+from reviews.signals import (
+    collect_tombstones, recalculate_title_ratings,
+    review_comment_count_changed, suspend_aggregates
+)
+from users.constants import MODERATION_BATCH_SIZE
+
+
+def delete_in_batches(queryset, parent_field, recalculate, batch_size,
+                      on_batch=None):
+    """
+    Удалить объекты пачками по batch_size в отдельных транзакциях.
+
+    Агрегаты родителей не пересчитываются по каждой удалённой записи:
+    после удаления пачки `recalculate` получает id затронутых
+    родителей, а записи об удалении сохраняются одним запросом.
+    `on_batch` в той же транзакции получает число удалённых в пачке
+    объектов по моделям. Возвращает число удалённых объектов по моделям.
+    """
+    deleted = {}
+    while True:
+        with transaction.atomic():
+            batch = list(queryset.order_by('pk').values_list(
+                'pk', parent_field
+            )[:batch_size])
+            if not batch:
+                return deleted
+            with suspend_aggregates(), collect_tombstones():
+                _, counts = queryset.model.objects.filter(
+                    pk__in=[pk for pk, _ in batch]
+                ).delete()
+            recalculate({parent_id for _, parent_id in batch})
+            if on_batch is not None:
+                on_batch(counts)
+        for label, count in counts.items():
+            deleted[label] = deleted.get(label, 0) + count
+
+
+def recalculate_comment_counts(review_ids):
+    """Пересчитать число комментариев отзывов с нуля."""
+    Review.objects.filter(pk__in=review_ids).recalculate_comment_counts()
+    review_comment_count_changed.send(
+        sender=Review, review_ids=tuple(review_ids)
+    )
+
+
+def delete_reviews(reviews, batch_size=MODERATION_BATCH_SIZE):
+    """Удалить отзывы с комментариями и пересчитать рейтинги."""
+    return delete_in_batches(
+        reviews, 'title_id', recalculate_title_ratings, batch_size
+    )
+
+
+def delete_comments(comments, batch_size=MODERATION_BATCH_SIZE):
+    """Удалить комментарии и пересчитать их число у отзывов."""
+    return delete_in_batches(
+        comments, 'review_id', recalculate_comment_counts, batch_size
+    )
+
+
+def get_deleted_counts(deleted):
+    return {
+        'reviews': deleted.get(Review._meta.label, 0),
+        'comments': deleted.get(Comment._meta.label, 0),
+    }
@@ -0,0 +1,77 @@
+"""Полнотекстовый поиск произведений на основе SQLite FTS5."""
+import re
+
+SEARCH_TABLE = 'reviews_title_fts'
+
+SEARCH_TRIGGERS = {
+    'reviews_title_fts_insert': (
+        'CREATE TRIGGER reviews_title_fts_insert '
+        'AFTER INSERT ON reviews_title BEGIN '
+        'INSERT INTO reviews_title_fts(rowid, name, description) '
+        'VALUES (new.id, new.name, new.description); '
+        'END'
+    ),
+    'reviews_title_fts_delete': (
+        'CREATE TRIGGER reviews_title_fts_delete '
+        'AFTER DELETE ON reviews_title BEGIN '
+        'INSERT INTO reviews_title_fts'
+        '(reviews_title_fts, rowid, name, description) '
+        "VALUES ('delete', old.id, old.name, old.description); "
+        'END'
+    ),
+    'reviews_title_fts_update': (
+        'CREATE TRIGGER reviews_title_fts_update '
+        'AFTER UPDATE OF name, description ON reviews_title BEGIN '
+        'INSERT INTO reviews_title_fts'
+        '(reviews_title_fts, rowid, name, description) '
+        "VALUES ('delete', old.id, old.name, old.description); "
+        'INSERT INTO reviews_title_fts(rowid, name, description) '
+        'VALUES (new.id, new.name, new.description); '
+        'END'
+    ),
+}
+
+
+def is_search_available(connection):
+    if connection.vendor != 'sqlite':
+        return False
+    return SEARCH_TABLE in connection.introspection.table_names()
+
+
+def rebuild_search_index(connection):
+    """Пересобрать индекс по текущему содержимому таблицы произведений."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')"
+        )
+
+
+def ensure_search_triggers(connection):
+    """
+    Создать недостающие триггеры синхронизации индекса.
+
+    SQLite удаляет триггеры при пересоздании таблицы в миграциях, и
+    изменения, сделанные без триггеров, в индекс не попали, поэтому
+    после их восстановления индекс пересобирается.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' "
+            'AND tbl_name = %s', ['reviews_title']
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        missing = [
+            sql for name, sql in SEARCH_TRIGGERS.items()
+            if name not in existing
+        ]
+        for sql in missing:
+            cursor.execute(sql)
+    if missing:
+        rebuild_search_index(connection)
+    return bool(missing)
+
+
+def to_search_query(text):
+    """Запрос FTS5 из пользовательского текста: все слова по префиксу."""
+    words = re.findall(r'\w+', text)
+    return ' '.join(f'"{word}"*' for word in words)
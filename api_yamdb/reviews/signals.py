@@ -0,0 +1,203 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+from django.db.models.signals import (
+    post_delete, post_init, post_migrate, post_save, pre_delete
+)
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from reviews.models import Category, Comment, Genre, Review, Title, Tombstone
+from reviews.search import ensure_search_triggers, is_search_available
+
+title_rating_changed = Signal()
+review_comment_count_changed = Signal()
+deletion_scheduled = Signal()
+aggregates_suspended = ContextVar('aggregates_suspended', default=False)
+collected_tombstones = ContextVar('collected_tombstones', default=None)
+
+
+@contextmanager
+def suspend_aggregates():
+    """
+    Отключить пересчёт рейтингов и счётчиков комментариев по записям.
+
+    Используется при массовых изменениях: вызывающий код сам
+    пересчитывает агрегаты один раз на произведение или отзыв.
+    """
+    token = aggregates_suspended.set(True)
+    try:
+        yield
+    finally:
+        aggregates_suspended.reset(token)
+
+
+def change_title_rating(title_id, score_delta, count_delta):
+    """Изменить сумму оценок и число отзывов произведения."""
+    Title.objects.filter(pk=title_id).change_ratings(
+        score_delta, count_delta
+    )
+    title_rating_changed.send(sender=Title, title_ids=(title_id,))
+
+
+def recalculate_title_ratings(title_ids):
+    """Пересчитать рейтинг произведений с нуля."""
+    Title.objects.filter(pk__in=title_ids).recalculate_ratings()
+    title_rating_changed.send(sender=Title, title_ids=tuple(title_ids))
+
+
+def remember_review_state(review):
+    """Запоминаем сохранённые в базе оценку и произведение отзыва."""
+    review._saved_score = review.__dict__.get('score')
+    review._saved_title_id = review.__dict__.get('title_id')
+
+
+@receiver(post_init, sender=Review)
+def review_initialized(sender, instance, **kwargs):
+    remember_review_state(instance)
+
+
+@receiver(post_save, sender=Review)
+def review_moved(sender, instance, created, raw=False, **kwargs):
+    """Комментарии хранят произведение отзыва и переносятся вместе с ним."""
+    if not created and instance._saved_title_id != instance.title_id:
+        Comment.objects.filter(review=instance).update(
+            title_id=instance.title_id
+        )
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    if raw or aggregates_suspended.get():
+        return
+    if created:
+        change_title_rating(instance.title_id, instance.score, 1)
+    elif instance._saved_score is None or instance._saved_title_id is None:
+        recalculate_title_ratings((instance.title_id,))
+    elif instance._saved_title_id != instance.title_id:
+        change_title_rating(
+            instance._saved_title_id, -instance._saved_score, -1
+        )
+        change_title_rating(instance.title_id, instance.score, 1)
+    elif instance._saved_score != instance.score:
+        change_title_rating(
+            instance.title_id, instance.score - instance._saved_score, 0
+        )
+    remember_review_state(instance)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    if aggregates_suspended.get():
+        return
+    score = instance._saved_score
+    if score is None:
+        score = instance.score
+    change_title_rating(instance._saved_title_id, -score, -1)
+
+
+def change_comment_count(review_id, delta):
+    """Изменить число комментариев отзыва."""
+    Review.objects.filter(pk=review_id).change_comment_counts(delta)
+    review_comment_count_changed.send(sender=Review, review_ids=(review_id,))
+
+
+@receiver(post_init, sender=Comment)
+def comment_initialized(sender, instance, **kwargs):
+    instance._saved_review_id = instance.__dict__.get('review_id')
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, raw=False, **kwargs):
+    if raw or aggregates_suspended.get():
+        return
+    if created:
+        change_comment_count(instance.review_id, 1)
+    elif instance._saved_review_id is None:
+        Review.objects.filter(
+            pk=instance.review_id
+        ).recalculate_comment_counts()
+        review_comment_count_changed.send(
+            sender=Review, review_ids=(instance.review_id,)
+        )
+    elif instance._saved_review_id != instance.review_id:
+        change_comment_count(instance._saved_review_id, -1)
+        change_comment_count(instance.review_id, 1)
+    instance._saved_review_id = instance.review_id
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    if aggregates_suspended.get():
+        return
+    review_id = instance._saved_review_id
+    if review_id is None:
+        review_id = instance.review_id
+    change_comment_count(review_id, -1)
+
+
+TOMBSTONE_PARENT_FIELDS = {
+    Title: None,
+    Review: 'title_id',
+    Comment: 'review_id',
+}
+
+
+@contextmanager
+def collect_tombstones():
+    """
+    Копить записи об удалении и сохранить их одним запросом на выходе.
+
+    Используется при массовых удалениях вместо вставки записи на
+    каждый удалённый объект.
+    """
+    tombstones = []
+    token = collected_tombstones.set(tombstones)
+    try:
+        yield tombstones
+    finally:
+        collected_tombstones.reset(token)
+    Tombstone.objects.bulk_create(tombstones)
+
+
+def record_tombstone(sender, instance, **kwargs):
+    """Запоминаем удаление для синхронизации клиентов."""
+    parent_field = TOMBSTONE_PARENT_FIELDS[sender]
+    tombstone = Tombstone(
+        model_name=sender._meta.model_name,
+        object_id=instance.pk,
+        parent_id=getattr(instance, parent_field) if parent_field else None,
+    )
+    tombstones = collected_tombstones.get()
+    if tombstones is None:
+        tombstone.save()
+    else:
+        tombstones.append(tombstone)
+
+
+for model in TOMBSTONE_PARENT_FIELDS:
+    post_delete.connect(record_tombstone, sender=model)
+
+
+@receiver((post_save, pre_delete), sender=Genre)
+def genre_changed(sender, instance, created=False, raw=False, **kwargs):
+    """Жанр входит в ответ произведения: отмечаем изменение произведений."""
+    if not created and not raw:
+        Title.objects.filter(genre=instance).update(updated_at=timezone.now())
+
+
+@receiver((post_save, pre_delete), sender=Category)
+def category_changed(sender, instance, created=False, raw=False, **kwargs):
+    """Категория входит в ответ произведения: отмечаем изменение."""
+    if not created and not raw:
+        Title.objects.filter(category=instance).update(
+            updated_at=timezone.now()
+        )
+
+
+@receiver(post_migrate)
+def restore_search_triggers(sender, using, **kwargs):
+    connection = connections[using]
+    if sender.name == 'reviews' and is_search_available(connection):
+        ensure_search_triggers(connection)
@@ -7,3 +7,9 @@ MAX_NAME_LENGTH = 256
 MIN_SCORE = 1
 MAX_SCORE = 10
 TEXT_PREVIEW_LENGTH = 15
+TOP_TITLES_LIMIT = 10
+BULK_TITLES_LIMIT = 1000
+TITLE_IDS_LIMIT = 50
+EMBEDDED_REVIEWS_LIMIT = 5
+MODERATION_IDS_LIMIT = 1000
+MODERATION_BATCH_SIZE = 200
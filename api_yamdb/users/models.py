@@ -43,6 +43,11 @@ class User(AbstractUser):
         verbose_name='Биография',
         blank=True,
     )
+    deletion_pending = models.BooleanField(
+        verbose_name='Ожидает удаления',
+        default=False,
+        editable=False
+    )
 
     class Meta:
         verbose_name = 'Пользователь'
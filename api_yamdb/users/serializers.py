@@ -65,7 +65,9 @@ class TokenSerializer(serializers.Serializer):
     confirmation_code = serializers.CharField()
 
     def validate(self, data):
-        user = get_object_or_404(User, username=data['username'])
+        user = get_object_or_404(
+            User, username=data['username'], deletion_pending=False
+        )
         if not default_token_generator.check_token(
             user,
             data['confirmation_code']
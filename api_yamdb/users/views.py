@@ -10,6 +10,8 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from api.v1.mixins import BackgroundDestroyMixin
+from api.v1.pagination import PageNumberOrKeysetPagination
 from api.v1.permissions import IsAdminOrSuperUser
 from api_yamdb.settings import DEFAULT_FROM_EMAIL
 from users.serializers import (
@@ -20,14 +22,16 @@ from users.serializers import (
 User = get_user_model()
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(BackgroundDestroyMixin, viewsets.ModelViewSet):
     """Вьюсет для работы с пользователями."""
 
-    queryset = User.objects.all()
+    queryset = User.objects.filter(deletion_pending=False)
     serializer_class = UserSerializer
     lookup_field = 'username'
     filter_backends = (SearchFilter,)
     search_fields = ('username',)
+    pagination_class = PageNumberOrKeysetPagination
+    keyset_ordering = ('username',)
     http_method_names = ('get', 'post', 'patch', 'delete', 'head', 'options')
     permission_classes = (IsAdminOrSuperUser,)
 
@@ -0,0 +1,85 @@
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_title(self, title_id):
+        from reviews.models import Title
+        return Title.objects.get(pk=title_id)
+
+    def test_01_rating_follows_review_changes(self, admin_client, admin,
+                                              user_client, user):
+        reviews, titles = create_reviews(
+            admin_client, {admin: admin_client}
+        )
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'Отлично', 10)
+        title = self.get_title(title_id)
+        assert (title.rating_sum, title.review_count) == (15, 2), (
+            'Проверьте, что при создании отзыва сумма оценок и количество '
+            'отзывов произведения увеличиваются.'
+        )
+
+        admin_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            ),
+            data={'score': 1}
+        )
+        title = self.get_title(title_id)
+        assert (title.rating_sum, title.review_count) == (11, 2), (
+            'Проверьте, что при изменении оценки отзыва пересчитывается '
+            'сумма оценок произведения.'
+        )
+        response = admin_client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.json().get('rating') == 5, (
+            'Проверьте, что поле `rating` произведения рассчитывается по '
+            'сохранённым сумме оценок и количеству отзывов.'
+        )
+
+        admin_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            )
+        )
+        title = self.get_title(title_id)
+        assert (title.rating_sum, title.review_count) == (10, 1), (
+            'Проверьте, что при удалении отзыва уменьшаются сумма оценок и '
+            'количество отзывов произведения.'
+        )
+
+        user.delete()
+        title = self.get_title(title_id)
+        assert (title.rating_sum, title.review_count) == (0, 0), (
+            'Проверьте, что при каскадном удалении отзывов вместе с автором '
+            'рейтинг произведения пересчитывается.'
+        )
+
+    def test_02_recalculate_ratings_command(self, admin_client, admin):
+        from reviews.models import Title
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        Title.objects.update(rating_sum=0, review_count=0)
+
+        call_command('recalculate_ratings')
+
+        title = self.get_title(titles[0]['id'])
+        assert (title.rating_sum, title.review_count) == (5, 1), (
+            'Проверьте, что команда `recalculate_ratings` восстанавливает '
+            'сумму оценок и количество отзывов по существующим отзывам.'
+        )
+        title = self.get_title(titles[1]['id'])
+        assert (title.rating_sum, title.review_count) == (0, 0), (
+            'Проверьте, что команда `recalculate_ratings` обнуляет рейтинг '
+            'произведений без отзывов.'
+        )
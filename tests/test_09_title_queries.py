@@ -0,0 +1,72 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import (
+    count_queries, create_categories, create_genre, create_many_titles
+)
+
+TITLE_LIST_QUERIES = 3
+TITLE_DETAIL_QUERIES = 2
+
+
+def count_representation_queries(title_id):
+    from api.v1.serializers import TitleWriteSerializer
+    from reviews.models import Title
+    title = Title.objects.get(pk=title_id)
+    with CaptureQueriesContext(connection) as context:
+        TitleWriteSerializer(title).data
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def test_01_title_list_queries_do_not_depend_on_page_size(
+            self, client, admin_client):
+        create_genre(admin_client)
+        create_categories(admin_client)
+        create_many_titles(1)
+        single_title_queries = count_queries(client, self.TITLES_URL)
+
+        create_many_titles(20)
+        full_page_queries = count_queries(client, self.TITLES_URL)
+
+        assert single_title_queries == full_page_queries, (
+            f'Проверьте, что количество запросов к БД при GET-запросе к '
+            f'`{self.TITLES_URL}` не зависит от количества произведений на '
+            'странице: жанры и категории должны загружаться заранее.'
+        )
+        assert full_page_queries <= TITLE_LIST_QUERIES, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` выполняет не '
+            f'более {TITLE_LIST_QUERIES} запросов к БД.'
+        )
+
+    def test_02_title_detail_and_write_queries(self, client, admin_client):
+        from reviews.models import Genre, Title
+        create_genre(admin_client)
+        create_categories(admin_client)
+        create_many_titles(1)
+        title = Title.objects.get()
+
+        detail_queries = count_queries(
+            client, self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+        )
+        assert detail_queries <= TITLE_DETAIL_QUERIES, (
+            'Проверьте, что GET-запрос к '
+            f'`{self.TITLE_DETAIL_URL_TEMPLATE}` выполняет не более '
+            f'{TITLE_DETAIL_QUERIES} запросов к БД.'
+        )
+
+        title.genre.set(Genre.objects.none())
+        few_genres_queries = count_representation_queries(title.id)
+        title.genre.set(Genre.objects.all())
+        many_genres_queries = count_representation_queries(title.id)
+        assert few_genres_queries == many_genres_queries, (
+            'Проверьте, что ответ на POST- и PATCH-запросы к '
+            f'`{self.TITLES_URL}` формируется за одинаковое количество '
+            'запросов к БД независимо от количества жанров.'
+        )
@@ -0,0 +1,83 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import collect_pages, create_comments, create_genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10KeysetPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_titles_cursor_pagination(self, client, admin_client):
+        from reviews.models import Title
+        create_genre(admin_client)
+        for idx in range(23):
+            Title.objects.create(name=f'Произведение {idx % 4}', year=2000)
+        expected = list(
+            Title.objects.order_by('name', 'id').values_list('id', flat=True)
+        )
+
+        results, pages = collect_pages(client, f'{self.TITLES_URL}?cursor=')
+        assert [title['id'] for title in results] == expected, (
+            f'Проверьте, что пагинация по курсору для `{self.TITLES_URL}` '
+            'возвращает все произведения без пропусков и повторов в порядке '
+            '(name, id), даже если названия совпадают.'
+        )
+        assert len(pages) == 3 and pages[0]['previous'] is None, (
+            'Проверьте, что первая страница пагинации по курсору не '
+            'содержит ссылку `previous`.'
+        )
+
+        results, _ = collect_pages(client, pages[-1]['previous'], 'previous')
+        assert [title['id'] for title in results] == expected[:20], (
+            'Проверьте, что ссылка `previous` при пагинации по курсору '
+            'возвращает предыдущие страницы в исходном порядке.'
+        )
+
+        response = client.get(f'{self.TITLES_URL}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что запрос с некорректным курсором возвращает ответ '
+            'со статусом 404.'
+        )
+
+        response = client.get(f'{self.TITLES_URL}?cursor=&ordering=-year')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что параметр `ordering` вместе с `cursor` '
+            'возвращает ответ со статусом 400, а не молча игнорируется.'
+        )
+
+        response = client.get(f'{self.TITLES_URL}?cursor=&search=Фильм')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что параметр `search` вместе с `cursor` возвращает '
+            'ответ со статусом 400: сортировка по релевантности с курсором '
+            'не сочетается.'
+        )
+
+    def test_02_comments_cursor_pagination(self, client, admin_client, admin):
+        from reviews.models import Comment
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        for idx in range(12):
+            Comment.objects.create(
+                text=f'comment {idx}', author=admin, review_id=reviews[0]['id']
+            )
+        expected = list(
+            Comment.objects.order_by('pub_date', 'id').values_list(
+                'id', flat=True
+            )
+        )
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+
+        results, _ = collect_pages(client, f'{url}?cursor=')
+        assert [comment['id'] for comment in results] == expected, (
+            f'Проверьте, что пагинация по курсору для `{url}` возвращает все '
+            'комментарии в порядке публикации.'
+        )
@@ -0,0 +1,98 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews, create_titles
+
+
+def get_count(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    count_queries = [
+        query for query in context.captured_queries
+        if 'COUNT(' in query['sql'].upper()
+    ]
+    return response.json()['count'], len(count_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11CountCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_title_count_is_cached_and_invalidated(self, client,
+                                                      admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        url = f'{self.TITLES_URL}?genre={genres[0]["slug"]}'
+        assert get_count(client, url) == (1, 1)
+        assert get_count(client, url) == (1, 0), (
+            f'Проверьте, что повторный GET-запрос к `{self.TITLES_URL}` с '
+            'теми же фильтрами берёт количество объектов из кеша.'
+        )
+        assert get_count(client, f'{url}&page=1') == (1, 0), (
+            'Проверьте, что номер страницы не влияет на ключ кеша '
+            'количества объектов.'
+        )
+
+        admin_client.post(self.TITLES_URL, data={
+            'name': 'Чужой',
+            'year': 1979,
+            'genre': [genres[0]['slug']],
+            'category': categories[0]['slug']
+        })
+        assert get_count(client, url) == (2, 1), (
+            f'Проверьте, что после создания произведения количество '
+            f'объектов в ответе на GET-запрос к `{self.TITLES_URL}` '
+            'пересчитывается.'
+        )
+
+    def test_02_review_count_estimate(self, client, admin_client, admin,
+                                      user_client, user, settings):
+        settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD = 1
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        assert get_count(client, url) == (1, 1)
+
+        user_client.post(url, data={'text': 'Ещё отзыв', 'score': 7})
+        assert get_count(client, url) == (1, 0), (
+            'Проверьте, что при количестве объектов выше порога '
+            '`PAGINATION_COUNT_ESTIMATE_THRESHOLD` отдаётся последнее '
+            'известное количество без нового подсчёта.'
+        )
+
+        settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD = 10
+        assert get_count(client, url) == (2, 1), (
+            'Проверьте, что ниже порога `PAGINATION_COUNT_ESTIMATE_THRESHOLD` '
+            'количество отзывов пересчитывается после записи.'
+        )
+
+    def test_03_estimate_does_not_cut_pages(self, client, admin_client,
+                                            admin, user_client, settings):
+        from tests.utils import add_reviews
+        settings.PAGINATION_COUNT_ESTIMATE_THRESHOLD = 1
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        assert get_count(client, url) == (1, 1)
+
+        user_client.post(url, data={'text': 'Ещё отзыв', 'score': 7})
+        texts = [review['text'] for review in client.get(url).json()[
+            'results'
+        ]]
+        assert 'Ещё отзыв' in texts, (
+            'Проверьте, что отзыв, добавленный после кеширования оценки '
+            'количества, попадает в выдачу.'
+        )
+
+        add_reviews(titles[0]['id'], 10)
+        response = client.get(f'{url}?page=2')
+        assert response.status_code == 200 and len(
+            response.json()['results']
+        ) == 2, (
+            'Проверьте, что устаревшая оценка количества не делает '
+            'последние страницы недоступными.'
+        )
+        assert client.get(url).json()['next'], (
+            'Проверьте, что ссылка на следующую страницу строится по '
+            'выбранным строкам, а не по оценке количества.'
+        )
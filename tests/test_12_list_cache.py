@@ -0,0 +1,57 @@
+import pytest
+
+from tests.utils import (
+    create_single_review, create_titles, get_with_queries
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ListCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    GENRES_URL = '/api/v1/genres/'
+
+    def test_01_title_list_cache(self, client, admin_client, user_client):
+        titles, _, genres = create_titles(admin_client)
+        url = f'{self.TITLES_URL}?year=1984&genre={genres[0]["slug"]}'
+        data, _ = get_with_queries(client, url)
+        cached_data, queries = get_with_queries(
+            client, f'{self.TITLES_URL}?genre={genres[0]["slug"]}&year=1984'
+        )
+        assert not queries and cached_data == data, (
+            f'Проверьте, что повторный GET-запрос к `{self.TITLES_URL}` с '
+            'теми же параметрами в другом порядке отдаётся из кеша без '
+            'обращения к БД.'
+        )
+
+        create_single_review(user_client, titles[0]['id'], 'Класс', 8)
+        data, queries = get_with_queries(client, url)
+        assert queries and data['results'][0]['rating'] == 8, (
+            f'Проверьте, что кеш ответа `{self.TITLES_URL}` сбрасывается '
+            'при изменении рейтинга произведения.'
+        )
+
+        admin_client.delete(f'{self.GENRES_URL}{genres[1]["slug"]}/')
+        data, queries = get_with_queries(client, url)
+        assert queries and len(data['results'][0]['genre']) == 1, (
+            f'Проверьте, что кеш ответа `{self.TITLES_URL}` сбрасывается '
+            'при удалении жанра.'
+        )
+
+    def test_02_genre_list_cache(self, client, admin_client):
+        create_titles(admin_client)
+        data, _ = get_with_queries(client, self.GENRES_URL)
+        _, queries = get_with_queries(client, self.GENRES_URL)
+        assert not queries, (
+            f'Проверьте, что повторный GET-запрос к `{self.GENRES_URL}` '
+            'отдаётся из кеша без обращения к БД.'
+        )
+
+        admin_client.post(
+            self.GENRES_URL, data={'name': 'Вестерн', 'slug': 'western'}
+        )
+        new_data, _ = get_with_queries(client, self.GENRES_URL)
+        assert new_data['count'] == data['count'] + 1, (
+            f'Проверьте, что кеш ответа `{self.GENRES_URL}` сбрасывается '
+            'при создании жанра.'
+        )
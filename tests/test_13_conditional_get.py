@@ -0,0 +1,136 @@
+import subprocess
+import sys
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.conftest import MANAGE_PATH
+from tests.utils import create_comments, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13ConditionalGet:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_title_detail_etag(self, client, admin_client, admin,
+                                  user_client):
+        _, _, titles = create_comments(admin_client, {admin: admin_client})
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = client.get(url)
+        etag = response.get('ETag')
+        assert etag and response.get('Last-Modified'), (
+            f'Проверьте, что ответ на GET-запрос к '
+            f'`{self.TITLE_DETAIL_URL_TEMPLATE}` содержит заголовки `ETag` '
+            'и `Last-Modified`.'
+        )
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что GET-запрос с совпадающим `If-None-Match` к '
+            f'`{self.TITLE_DETAIL_URL_TEMPLATE}` возвращает ответ со '
+            'статусом 304.'
+        )
+        assert not context.captured_queries, (
+            'Проверьте, что ответ со статусом 304 формируется без '
+            'обращения к БД.'
+        )
+
+        create_single_review(user_client, titles[0]['id'], 'Хорошо', 9)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения рейтинга произведения GET-запрос '
+            f'со старым `If-None-Match` к `{self.TITLE_DETAIL_URL_TEMPLATE}` '
+            'возвращает ответ со статусом 200.'
+        )
+        assert response.get('ETag') != etag
+
+        for url, status in (
+            (url, HTTPStatus.NOT_MODIFIED),
+            (self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=100500),
+             HTTPStatus.NOT_FOUND),
+        ):
+            response = client.get(url, HTTP_IF_NONE_MATCH='*')
+            assert response.status_code == status, (
+                'Проверьте, что `If-None-Match: *` возвращает 304 только '
+                'для существующего объекта.'
+            )
+
+    def test_02_review_and_comment_lists_validators(self, client,
+                                                    admin_client, admin):
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        for url in (reviews_url, comments_url):
+            last_modified = client.get(url).get('Last-Modified')
+            response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что GET-запрос к `{url}` с `If-Modified-Since`, '
+                'равным `Last-Modified`, возвращает ответ со статусом 304.'
+            )
+
+        etag = client.get(comments_url).get('ETag')
+        admin_client.post(comments_url, data={'text': 'Ещё комментарий'})
+        response = client.get(comments_url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что после добавления комментария GET-запрос к '
+            f'`{comments_url}` со старым `If-None-Match` возвращает ответ '
+            'со статусом 200.'
+        )
+
+    def test_03_recalculation_commands(self, client, admin_client, admin):
+        from reviews.models import Review, Title
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        title_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        title_etag = client.get(title_url).get('ETag')
+        reviews_etag = client.get(reviews_url).get('ETag')
+        Review.objects.update(score=1)
+        Review.objects.update(comment_count=0)
+
+        call_command('recalculate_ratings')
+        call_command('recalculate_comment_counts')
+        for url, etag in (
+            (title_url, title_etag), (reviews_url, reviews_etag)
+        ):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что команды пересчёта рейтингов и числа '
+                f'комментариев сбрасывают кеш `{url}`.'
+            )
+        assert Title.objects.get(pk=titles[0]['id']).rating == 1
+
+    def test_04_cache_shared_between_processes(self):
+        from django.core.cache import cache
+        subprocess.run(
+            [
+                sys.executable, 'manage.py', 'shell', '-c',
+                'from django.core.cache import cache; '
+                'cache.set("version:titles", 1, None)'
+            ],
+            cwd=MANAGE_PATH, check=True
+        )
+        assert cache.get('version:titles') == 1, (
+            'Проверьте, что кеш общий для процессов: версии, изменённые '
+            'командами manage.py, должны быть видны серверу.'
+        )
@@ -0,0 +1,64 @@
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_titles
+
+
+def search(client, text):
+    response = client.get('/api/v1/titles/', {'search': text})
+    assert response.status_code == 200, (
+        'Проверьте, что GET-запрос к `/api/v1/titles/` с параметром '
+        '`search` возвращает ответ со статусом 200.'
+    )
+    return [title['name'] for title in response.json()['results']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14TitleSearch:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+    def test_01_search_by_name_and_description(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        assert search(client, 'орешек') == ['Крепкий орешек'], (
+            'Проверьте, что параметр `search` ищет произведения по названию.'
+        )
+        assert search(client, 'back') == ['Терминатор'], (
+            'Проверьте, что параметр `search` ищет произведения по описанию.'
+        )
+        assert search(client, 'терми') == ['Терминатор'], (
+            'Проверьте, что параметр `search` находит слова по префиксу.'
+        )
+        assert search(client, '"(*') == ['Крепкий орешек', 'Терминатор'], (
+            'Проверьте, что `search` без слов не фильтрует произведения.'
+        )
+
+        admin_client.patch(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[1]['id']),
+            data={'name': 'Смертельное оружие'}
+        )
+        assert search(client, 'орешек') == [], (
+            'Проверьте, что индекс поиска обновляется при изменении '
+            'названия произведения.'
+        )
+        assert search(client, 'оружие') == ['Смертельное оружие']
+
+        admin_client.delete(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        )
+        assert search(client, 'back') == [], (
+            'Проверьте, что удалённые произведения пропадают из поиска.'
+        )
+
+    def test_02_search_ranking_and_rebuild(self, client, admin_client):
+        from reviews.models import Title
+        Title.objects.bulk_create([
+            Title(name='Солярис', year=1972, description='Океан и станция'),
+            Title(name='Океан', year=2009, description='Океан, океан, океан'),
+        ])
+        call_command('rebuild_title_search')
+        assert search(client, 'океан') == ['Океан', 'Солярис'], (
+            'Проверьте, что результаты поиска упорядочены по релевантности и '
+            'команда `rebuild_title_search` индексирует существующие '
+            'произведения.'
+        )
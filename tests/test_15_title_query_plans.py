@@ -0,0 +1,52 @@
+import itertools
+
+import pytest
+
+from tests.utils import get_query_plan
+
+FILTER_VALUES = {
+    'category': 'films',
+    'genre': 'drama',
+    'year': '1984',
+    'name': 'Терминатор',
+}
+ORDERINGS = ('name', '-name', 'id', '-id', 'year', '-year')
+FILTER_COMBINATIONS = [
+    combination
+    for size in range(len(FILTER_VALUES) + 1)
+    for combination in itertools.combinations(FILTER_VALUES, size)
+]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('ordering', ORDERINGS)
+@pytest.mark.parametrize('filters', FILTER_COMBINATIONS, ids=str)
+def test_title_list_query_plan(filters, ordering):
+    from api.v1.filters import TitleFilter
+    from api.v1.views import TitleViewSet
+
+    queryset = TitleFilter(
+        {name: FILTER_VALUES[name] for name in filters},
+        queryset=TitleViewSet.queryset
+    ).qs.order_by(ordering)[:10]
+    plan = get_query_plan(queryset)
+
+    full_scans = [
+        step for step in plan
+        if step.startswith('SCAN') and 'USING' not in step
+        and not (not filters and ordering.lstrip('-') == 'id')
+    ]
+    assert not full_scans, (
+        f'Проверьте, что для фильтров {filters} и сортировки `{ordering}` '
+        f'запрос списка произведений использует индексы: {plan}'
+    )
+    # Отдельных индексов по year и category нет: они дублировали бы
+    # составные, поэтому по id сортируются уже отобранные строки.
+    sorts_filtered_by_id = ordering.lstrip('-') == 'id' and filters in (
+        ('year',), ('category',)
+    )
+    if 'genre' not in filters and not sorts_filtered_by_id:
+        assert not any('TEMP B-TREE' in step for step in plan), (
+            f'Проверьте, что для фильтров {filters} и сортировки '
+            f'`{ordering}` произведения сортируются по индексу: {plan}'
+        )
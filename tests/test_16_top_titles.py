@@ -0,0 +1,90 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+def add_scored_reviews(title_id, scores, first_reviewer=0):
+    from reviews.models import Review, User
+    for idx, score in enumerate(scores, first_reviewer):
+        author, _ = User.objects.get_or_create(
+            username=f'reviewer{idx}', email=f'reviewer{idx}@yamdb.fake'
+        )
+        Review.objects.create(
+            author=author, title_id=title_id, text='Отзыв', score=score
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16TopTitles:
+
+    TITLES_URL = '/api/v1/titles/'
+    TOP_TITLES_URL = '/api/v1/titles/top/'
+
+    def test_01_rating_ordering(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        add_scored_reviews(titles[0]['id'], [3, 4])
+        add_scored_reviews(titles[1]['id'], [9])
+
+        response = client.get(self.TITLES_URL, {'ordering': '-rating'})
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[1]['id'], titles[0]['id']
+        ], (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` поддерживает '
+            'сортировку `ordering=-rating`.'
+        )
+
+    def test_02_top_titles(self, client, admin_client, settings):
+        settings.TOP_TITLES_MIN_REVIEWS = 2
+        titles, categories, _ = create_titles(admin_client)
+        add_scored_reviews(titles[0]['id'], [6, 7])
+        add_scored_reviews(titles[1]['id'], [10])
+
+        response = client.get(self.TOP_TITLES_URL)
+        assert response.status_code == 200, (
+            f'Эндпоинт `{self.TOP_TITLES_URL}` не найден или недоступен без '
+            'токена.'
+        )
+        assert [title['id'] for title in response.json()] == [
+            titles[0]['id']
+        ], (
+            f'Проверьте, что `{self.TOP_TITLES_URL}` не возвращает '
+            'произведения с количеством отзывов меньше '
+            '`TOP_TITLES_MIN_REVIEWS`.'
+        )
+
+        add_scored_reviews(titles[1]['id'], [10, 9], first_reviewer=1)
+        response = client.get(self.TOP_TITLES_URL)
+        assert [title['id'] for title in response.json()] == [
+            titles[1]['id'], titles[0]['id']
+        ], (
+            f'Проверьте, что `{self.TOP_TITLES_URL}` упорядочивает '
+            'произведения по убыванию рейтинга.'
+        )
+        response = client.get(
+            self.TOP_TITLES_URL, {'category': categories[0]['slug']}
+        )
+        assert [title['id'] for title in response.json()] == [
+            titles[0]['id']
+        ], (
+            f'Проверьте, что `{self.TOP_TITLES_URL}` поддерживает фильтр '
+            'по категории.'
+        )
+
+    @pytest.mark.parametrize('params', ({}, {'category': 'films'}))
+    def test_03_top_titles_use_index(self, client, params):
+        with CaptureQueriesContext(connection) as context:
+            client.get(self.TOP_TITLES_URL, params)
+        sql = context.captured_queries[0]['sql']
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plan = [row[-1] for row in cursor.fetchall()]
+        assert not any(
+            'TEMP B-TREE' in step
+            or step.startswith('SCAN') and 'USING' not in step
+            for step in plan
+        ), (
+            f'Проверьте, что топ произведений выбирается по индексу '
+            f'рейтинга: {plan}'
+        )
@@ -0,0 +1,131 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+def post_bulk(client, items):
+    with CaptureQueriesContext(connection) as context:
+        response = client.post(
+            '/api/v1/titles/bulk/', data=items, format='json'
+        )
+    return response, len(context.captured_queries)
+
+
+def new_titles(count):
+    return [
+        {
+            'name': f'Произведение {idx}',
+            'year': 2000 + idx % 20,
+            'genre': ['horror', 'comedy'],
+            'category': 'films',
+        }
+        for idx in range(count)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17BulkTitles:
+
+    BULK_URL = '/api/v1/titles/bulk/'
+
+    def test_01_bulk_create_and_update(self, admin_client):
+        from reviews.models import Title
+        titles, _, _ = create_titles(admin_client)
+        items = [
+            *new_titles(2),
+            {'id': titles[0]['id'], 'year': 1985, 'genre': ['drama']},
+            {'name': 'Без категории', 'year': 2000, 'genre': ['horror'],
+             'category': 'unknown'},
+            {'id': 100500, 'name': 'Нет такого'},
+        ]
+        response, _ = post_bulk(admin_client, items)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что POST-запрос администратора к `{self.BULK_URL}` '
+            'возвращает ответ со статусом 200.'
+        )
+        results = response.json()
+        assert [result['status'] for result in results] == [
+            201, 201, 200, 400, 400
+        ], (
+            'Проверьте, что пакетная запись возвращает результат для каждого '
+            'элемента в порядке запроса.'
+        )
+        assert 'category' in results[3]['errors'], (
+            'Проверьте, что для несуществующей категории в результате '
+            'элемента возвращается ошибка поля `category`.'
+        )
+
+        created = Title.objects.get(pk=results[0]['id'])
+        assert set(created.genre.values_list('slug', flat=True)) == {
+            'horror', 'comedy'
+        } and created.category.slug == 'films', (
+            'Проверьте, что пакетное создание сохраняет жанры и категорию.'
+        )
+        updated = Title.objects.get(pk=titles[0]['id'])
+        assert updated.year == 1985 and updated.name == titles[0]['name'], (
+            'Проверьте, что пакетное обновление меняет только переданные '
+            'поля.'
+        )
+        assert list(updated.genre.values_list('slug', flat=True)) == [
+            'drama'
+        ], 'Проверьте, что пакетное обновление заменяет жанры произведения.'
+        assert not Title.objects.filter(name='Без категории').exists(), (
+            'Проверьте, что элементы с ошибками не сохраняются.'
+        )
+
+        response = admin_client.get('/api/v1/titles/?name=Произведение 1')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что после пакетной записи список произведений '
+            'не отдаётся из устаревшего кеша.'
+        )
+
+    def test_02_bulk_queries_do_not_depend_on_batch_size(self, admin_client):
+        create_titles(admin_client)
+        _, small_batch_queries = post_bulk(admin_client, new_titles(2))
+        _, large_batch_queries = post_bulk(admin_client, new_titles(50))
+        assert small_batch_queries == large_batch_queries, (
+            'Проверьте, что количество запросов к БД при пакетной записи '
+            'не зависит от количества произведений в пакете.'
+        )
+
+    def test_04_bulk_locks_before_reading_ids(self, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        with CaptureQueriesContext(connection) as context:
+            admin_client.post(
+                self.BULK_URL,
+                data=[{'id': titles[0]['id'], 'year': 1999}, *new_titles(2)],
+                format='json'
+            )
+        queries = [query['sql'] for query in context.captured_queries]
+        lock = next(
+            (index for index, sql in enumerate(queries)
+             if sql.startswith('UPDATE sqlite_sequence')),
+            None
+        )
+        first_read = next(
+            index for index, sql in enumerate(queries)
+            if sql.startswith('SELECT') and 'FROM "reviews_title"' in sql
+        )
+        assert lock is not None and lock < first_read, (
+            'Проверьте, что пакетное создание берёт блокировку записи SQLite '
+            'до чтения произведений и последнего id: иначе одновременные '
+            'пакеты получат одинаковые id.'
+        )
+
+    def test_03_bulk_permissions_and_limits(self, user_client, admin_client):
+        response, _ = post_bulk(user_client, new_titles(1))
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что пакетная запись доступна только администратору.'
+        )
+        response, _ = post_bulk(admin_client, {'name': 'Не список'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что пакетная запись принимает только список.'
+        )
+        response, _ = post_bulk(admin_client, [{}] * 1001)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что размер пакета ограничен.'
+        )
@@ -0,0 +1,57 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles, get_with_queries
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18SparseFields:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_list_fields(self, client, admin_client):
+        create_titles(admin_client)
+        _, full_queries = get_with_queries(client, self.TITLES_URL)
+        data, queries = get_with_queries(
+            client, f'{self.TITLES_URL}?fields=id,name,rating'
+        )
+        assert all(
+            set(title) == {'id', 'name', 'rating'} for title in data['results']
+        ), (
+            'Проверьте, что параметр `fields` оставляет в ответе только '
+            'перечисленные поля.'
+        )
+        assert len(queries) == len(full_queries) - 1, (
+            'Проверьте, что без поля `genre` жанры не загружаются отдельным '
+            'запросом.'
+        )
+        assert not any(
+            'description' in sql or 'reviews_category' in sql
+            for sql in queries
+        ), (
+            'Проверьте, что незапрошенные поля и категория не выбираются '
+            'из БД.'
+        )
+
+    def test_02_retrieve_fields(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        data, _ = get_with_queries(
+            client,
+            f'{self.TITLES_URL}{titles[0]["id"]}/?fields=name,category'
+        )
+        assert data == {
+            'name': titles[0]['name'],
+            'category': {'name': 'Фильм', 'slug': 'films'},
+        }, (
+            'Проверьте, что параметр `fields` работает при получении '
+            'отдельного произведения.'
+        )
+
+    def test_03_unknown_field(self, client, admin_client):
+        create_titles(admin_client)
+        response = client.get(f'{self.TITLES_URL}?fields=name,secret')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что запрос с неизвестным полем в параметре `fields` '
+            'возвращает ответ со статусом 400.'
+        )
@@ -0,0 +1,60 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_categories, create_genre, create_many_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19TitleIds:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_by_ids(self, client, ids):
+        url = f'{self.TITLES_URL}?ids={",".join(map(str, ids))}'
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return response.json(), len(context.captured_queries)
+
+    def test_01_titles_by_ids(self, client, admin_client):
+        from reviews.models import Title
+        create_genre(admin_client)
+        create_categories(admin_client)
+        create_many_titles(30)
+        ids = list(Title.objects.order_by('-id').values_list('id', flat=True))
+
+        data, few_queries = self.get_by_ids(client, [ids[3], 100500, ids[1]])
+        assert [title['id'] for title in data] == [ids[3], ids[1]], (
+            'Проверьте, что параметр `ids` возвращает список произведений '
+            'без пагинации в порядке запроса и пропускает несуществующие id.'
+        )
+        assert data[0]['genre'] and data[0]['category'], (
+            'Проверьте, что выборка по `ids` содержит жанры и категорию.'
+        )
+
+        data, many_queries = self.get_by_ids(client, ids[:25])
+        assert [title['id'] for title in data] == ids[:25], (
+            'Проверьте, что выборка по `ids` сохраняет порядок запроса.'
+        )
+        assert few_queries == many_queries, (
+            'Проверьте, что количество запросов к БД при выборке по `ids` '
+            'не зависит от количества id.'
+        )
+
+    def test_02_ids_validation(self, client):
+        response = client.get(f'{self.TITLES_URL}?ids=1,a')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что некорректный параметр `ids` возвращает ответ '
+            'со статусом 400.'
+        )
+        ids = ','.join(str(pk) for pk in range(1, 52))
+        response = client.get(f'{self.TITLES_URL}?ids={ids}')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что количество id в параметре `ids` ограничено.'
+        )
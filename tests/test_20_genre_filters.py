@@ -0,0 +1,75 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles, get_query_plan
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20GenreFilters:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def get_names(self, client, query):
+        response = client.get(f'{self.TITLES_URL}?{query}')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}?{query}` '
+            'возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        names = [title['name'] for title in data['results']]
+        assert data['count'] == len(names), (
+            'Проверьте, что фильтр по жанрам не дублирует произведения и '
+            'не искажает поле `count`.'
+        )
+        return sorted(names)
+
+    def test_01_any_of_genres(self, client, admin_client):
+        create_titles(admin_client)
+        assert self.get_names(client, 'genre=horror,comedy') == [
+            'Терминатор'
+        ], (
+            'Проверьте, что фильтр `genre` со списком жанров возвращает '
+            'произведение с несколькими подходящими жанрами один раз.'
+        )
+        assert self.get_names(client, 'genre=comedy,drama') == [
+            'Крепкий орешек', 'Терминатор'
+        ], (
+            'Проверьте, что фильтр `genre` возвращает произведения хотя бы '
+            'с одним из перечисленных жанров.'
+        )
+
+    def test_02_all_of_genres(self, client, admin_client):
+        create_titles(admin_client)
+        assert self.get_names(client, 'genre_all=horror,comedy') == [
+            'Терминатор'
+        ], (
+            'Проверьте, что фильтр `genre_all` возвращает произведения со '
+            'всеми перечисленными жанрами.'
+        )
+        assert self.get_names(client, 'genre_all=horror,drama') == [], (
+            'Проверьте, что фильтр `genre_all` не возвращает произведения, '
+            'у которых есть только часть жанров.'
+        )
+
+    def test_03_genre_filters_use_index(self):
+        from api.v1.filters import TitleFilter
+        from api.v1.views import TitleViewSet
+        queryset = TitleFilter(
+            {'genre': 'horror,drama', 'genre_all': 'comedy,drama'},
+            queryset=TitleViewSet.queryset
+        ).qs
+        sql = str(queryset.query).upper()
+        assert 'DISTINCT' not in sql and 'JOIN "REVIEWS_TITLE_GENRE"' not in (
+            sql.split('WHERE')[0]
+        ), (
+            'Проверьте, что фильтры по жанрам не присоединяют таблицу '
+            'жанров к запросу произведений.'
+        )
+        plan = get_query_plan(queryset)
+        assert not any(
+            step.startswith('SCAN') and 'USING' not in step for step in plan
+        ), (
+            'Проверьте, что фильтры по жанрам используют индексы: '
+            f'{plan}'
+        )
@@ -0,0 +1,83 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21TitleFacets:
+
+    FACETS_URL = '/api/v1/titles/facets/'
+
+    def get_facets(self, client, query=''):
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(f'{self.FACETS_URL}?{query}')
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{self.FACETS_URL}` возвращает '
+            'ответ со статусом 200.'
+        )
+        return response.json(), len(context.captured_queries)
+
+    def test_01_facet_counts(self, client, admin_client):
+        create_titles(admin_client)
+        data, _ = self.get_facets(client)
+        assert data == {
+            'genre': [
+                {'slug': 'comedy', 'count': 1},
+                {'slug': 'drama', 'count': 1},
+                {'slug': 'horror', 'count': 1},
+            ],
+            'category': [
+                {'slug': 'books', 'count': 1},
+                {'slug': 'films', 'count': 1},
+            ],
+            'year': [{'decade': 1980, 'count': 2}],
+        }, (
+            f'Проверьте, что `{self.FACETS_URL}` возвращает количество '
+            'произведений по жанрам, категориям и десятилетиям.'
+        )
+
+        data, _ = self.get_facets(client, 'category=films&facets=genre')
+        assert data == {'genre': [
+            {'slug': 'comedy', 'count': 1}, {'slug': 'horror', 'count': 1}
+        ]}, (
+            'Проверьте, что группы считаются с учётом фильтров списка '
+            'произведений, а параметр `facets` выбирает группы.'
+        )
+
+        data, _ = self.get_facets(client, 'search=орешек')
+        assert data == {
+            'genre': [{'slug': 'drama', 'count': 1}],
+            'category': [{'slug': 'books', 'count': 1}],
+            'year': [{'decade': 1980, 'count': 1}],
+        }, 'Проверьте, что все группы учитывают полнотекстовый поиск.'
+
+    def test_02_facets_cache(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        _, first_queries = self.get_facets(client, 'page=1')
+        _, cached_queries = self.get_facets(client, 'page=2')
+        assert first_queries == 1 and cached_queries == 0, (
+            'Проверьте, что все группы считаются одним запросом и '
+            'кешируются по набору фильтров без учёта пагинации.'
+        )
+
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/', data={'year': 1999}
+        )
+        data, _ = self.get_facets(client, 'facets=year')
+        assert data == {'year': [
+            {'decade': 1980, 'count': 1}, {'decade': 1990, 'count': 1}
+        ]}, (
+            'Проверьте, что кеш групп сбрасывается при изменении '
+            'произведений.'
+        )
+
+    def test_03_unknown_facet(self, client):
+        response = client.get(f'{self.FACETS_URL}?facets=rating')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что запрос неизвестной группы возвращает ответ '
+            'со статусом 400.'
+        )
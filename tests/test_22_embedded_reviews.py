@@ -0,0 +1,116 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles, get_query_plan, get_with_queries
+
+
+def create_title_reviews(title_id, count):
+    from django.contrib.auth import get_user_model
+    from reviews.models import Review
+    User = get_user_model()
+    for idx in range(count):
+        author = User.objects.create(
+            username=f'reviewer_{title_id}_{idx}',
+            email=f'reviewer_{title_id}_{idx}@yamdb.fake'
+        )
+        Review.objects.create(
+            text=f'Отзыв {idx}', score=5, author=author, title_id=title_id
+        )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22EmbeddedReviews:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_retrieve_with_reviews(self, client, admin_client):
+        from users.constants import EMBEDDED_REVIEWS_LIMIT
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_title_reviews(title_id, EMBEDDED_REVIEWS_LIMIT + 2)
+        url = f'{self.TITLES_URL}{title_id}/?include=reviews'
+
+        data, queries = get_with_queries(client, url)
+        texts = [review['text'] for review in data['reviews']]
+        assert texts == [
+            f'Отзыв {idx}' for idx in range(
+                EMBEDDED_REVIEWS_LIMIT + 1, 1, -1
+            )
+        ], (
+            'Проверьте, что `include=reviews` добавляет в ответ последние '
+            f'{EMBEDDED_REVIEWS_LIMIT} отзывов от новых к старым.'
+        )
+        assert data['reviews'][0]['author'] == (
+            f'reviewer_{title_id}_{EMBEDDED_REVIEWS_LIMIT + 1}'
+        ), 'Проверьте, что встроенные отзывы содержат автора.'
+        assert len(queries) == 3, (
+            'Проверьте, что произведение с отзывами загружается '
+            'фиксированным числом запросов к БД.'
+        )
+
+        response = client.get(f'{self.TITLES_URL}{title_id}/')
+        assert 'reviews' not in response.json(), (
+            'Проверьте, что без `include=reviews` отзывы не добавляются.'
+        )
+
+    def test_02_list_with_reviews(self, client, admin_client):
+        from users.constants import EMBEDDED_REVIEWS_LIMIT
+        titles, _, _ = create_titles(admin_client)
+        create_title_reviews(titles[0]['id'], 1)
+        _, few_queries = get_with_queries(
+            client, f'{self.TITLES_URL}?include=reviews&cursor='
+        )
+        create_title_reviews(titles[1]['id'], 9)
+        data, many_queries = get_with_queries(
+            client, f'{self.TITLES_URL}?include=reviews&cursor='
+        )
+        assert len(few_queries) == len(many_queries), (
+            'Проверьте, что количество запросов к БД для списка с отзывами '
+            'не зависит от количества отзывов.'
+        )
+        assert sorted(
+            len(title['reviews']) for title in data['results']
+        ) == [1, EMBEDDED_REVIEWS_LIMIT], (
+            'Проверьте, что в списке произведений число встроенных отзывов '
+            'ограничено для каждого произведения.'
+        )
+
+    def test_03_embedded_reviews_cache(self, client, admin_client):
+        from reviews.models import Review
+        titles, _, _ = create_titles(admin_client)
+        create_title_reviews(titles[0]['id'], 1)
+        client.get(f'{self.TITLES_URL}?include=reviews')
+        Review.objects.update(text='Изменён')
+        Review.objects.get().save()
+        data, _ = get_with_queries(
+            client, f'{self.TITLES_URL}?include=reviews'
+        )
+        texts = [
+            review['text'] for title in data['results']
+            for review in title['reviews']
+        ]
+        assert texts == ['Изменён'], (
+            'Проверьте, что кеш списка с отзывами сбрасывается при '
+            'изменении отзыва.'
+        )
+
+    def test_04_unknown_include(self, client):
+        response = client.get(f'{self.TITLES_URL}?include=comments')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что неизвестное значение `include` возвращает ответ '
+            'со статусом 400.'
+        )
+
+
+@pytest.mark.django_db
+def test_latest_reviews_query_plan():
+    from api.v1.views import TitleViewSet
+    plan = get_query_plan(TitleViewSet.get_latest_reviews((1, 2, 3)))
+    assert plan.count(
+        'SEARCH U0 USING COVERING INDEX review_title_pub_date_idx '
+        '(title_id=?)'
+    ) >= 3 and not any(step.startswith('SCAN') for step in plan), (
+        'Проверьте, что последние отзывы каждого произведения выбираются '
+        f'по индексу без просмотра всех отзывов: {plan}'
+    )
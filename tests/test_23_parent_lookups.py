@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews, parent_selects, post_with_queries
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23ParentLookups:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_review_create_checks_title_once(self, admin_client, admin,
+                                                user_client):
+        _, titles = create_reviews(admin_client, {admin: admin_client})
+        response, queries = post_with_queries(
+            user_client,
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            {'text': 'Отзыв', 'score': 7}
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что POST-запрос пользователя к отзывам возвращает '
+            'ответ со статусом 201.'
+        )
+        title_selects = parent_selects(queries, 'reviews_title')
+        assert len(title_selects) == 1 and (
+            title_selects[0].startswith('SELECT (1) AS "a"')
+        ), (
+            'Проверьте, что при создании отзыва существование произведения '
+            'проверяется одним запросом без загрузки его полей.'
+        )
+
+    def test_02_comment_create_checks_review_once(self, admin_client,
+                                                  admin):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        response, queries = post_with_queries(
+            admin_client,
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[0]['id']
+            ),
+            {'text': 'Комментарий'}
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что POST-запрос к комментариям возвращает ответ '
+            'со статусом 201.'
+        )
+        review_selects = parent_selects(queries, 'reviews_review')
+        assert len(review_selects) == 1 and (
+            review_selects[0].startswith('SELECT (1) AS "a"')
+        ), (
+            'Проверьте, что при создании комментария существование отзыва '
+            'проверяется одним запросом без загрузки его полей.'
+        )
+
+    def test_03_comment_requires_review_of_title(self, admin_client,
+                                                 admin):
+        reviews, titles = create_reviews(admin_client, {admin: admin_client})
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[1]['id'], review_id=reviews[0]['id']
+        )
+        response, _ = post_with_queries(admin_client, url, {'text': 'x'})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что комментарий к отзыву другого произведения '
+            'возвращает ответ со статусом 404.'
+        )
+        response = admin_client.get(f'{url}')
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что список комментариев к отзыву другого '
+            'произведения возвращает ответ со статусом 404.'
+        )
@@ -0,0 +1,78 @@
+import pytest
+from django.core.cache import cache
+
+from tests.utils import (
+    add_comments, add_reviews, create_titles, get_with_queries
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24AuthorQueries:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    @pytest.mark.parametrize('url_suffix', ('', '?cursor='))
+    def test_01_review_list_queries(self, client, admin_client, url_suffix):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id) + url_suffix
+        add_reviews(title_id, 1)
+        cache.clear()
+        _, single_row_queries = get_with_queries(client, url)
+        add_reviews(title_id, 99)
+        cache.clear()
+        data, full_page_queries = get_with_queries(client, url)
+        assert all(review['author'] for review in data['results']), (
+            'Проверьте, что отзывы в списке содержат автора.'
+        )
+        assert len(single_row_queries) == len(full_page_queries), (
+            f'Проверьте, что количество запросов к БД для `{url}` не '
+            'зависит от количества отзывов на странице: автор должен '
+            'загружаться в том же запросе.'
+        )
+
+    @pytest.mark.parametrize('url_suffix', ('', '?cursor='))
+    def test_02_comment_list_queries(self, client, admin_client, admin,
+                                     url_suffix):
+        from reviews.models import Review
+        titles, _, _ = create_titles(admin_client)
+        add_reviews(titles[0]['id'], 1)
+        review = Review.objects.get()
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=review.id
+        ) + url_suffix
+        add_comments(review.id, admin, 1)
+        cache.clear()
+        _, single_row_queries = get_with_queries(client, url)
+        add_comments(review.id, review.author, 99)
+        cache.clear()
+        data, full_page_queries = get_with_queries(client, url)
+        assert all(comment['author'] for comment in data['results']), (
+            'Проверьте, что комментарии в списке содержат автора.'
+        )
+        assert len(single_row_queries) == len(full_page_queries), (
+            f'Проверьте, что количество запросов к БД для `{url}` не '
+            'зависит от количества комментариев на странице.'
+        )
+
+    def test_03_review_detail_queries(self, client, admin_client):
+        from reviews.models import Review
+        titles, _, _ = create_titles(admin_client)
+        add_reviews(titles[0]['id'], 1)
+        review = Review.objects.get()
+        cache.clear()
+        data, queries = get_with_queries(
+            client,
+            f'{self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]["id"])}'
+            f'{review.id}/'
+        )
+        assert len(queries) == 1, (
+            'Проверьте, что отзыв вместе с автором загружается одним '
+            'запросом к БД.'
+        )
+        assert data['author'] == review.author.username, (
+            'Проверьте, что отзыв содержит автора.'
+        )
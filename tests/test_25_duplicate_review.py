@@ -0,0 +1,45 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles, parent_selects, post_with_queries
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25DuplicateReview:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_duplicate_review_uses_constraint(self, admin_client,
+                                                 user_client):
+        from reviews.models import Title
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        response, queries = post_with_queries(
+            user_client, url, {'text': 'Отзыв', 'score': 7}
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            f'Проверьте, что POST-запрос пользователя к `{url}` возвращает '
+            'ответ со статусом 201.'
+        )
+        assert not parent_selects(queries, 'reviews_review'), (
+            'Проверьте, что перед созданием отзыва не выполняется отдельная '
+            'проверка на повторный отзыв.'
+        )
+
+        response, _ = post_with_queries(
+            user_client, url, {'text': 'Ещё отзыв', 'score': 1}
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв пользователя на произведение '
+            'возвращает ответ со статусом 400.'
+        )
+        assert response.json() == {
+            'non_field_errors': ['Отзыв уже оставлен']
+        }, 'Проверьте текст ошибки при повторном отзыве.'
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.review_count) == (7, 1), (
+            'Проверьте, что отклонённый повторный отзыв не меняет рейтинг '
+            'произведения.'
+        )
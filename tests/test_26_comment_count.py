@@ -0,0 +1,101 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import add_comments, create_comments, create_single_comment
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26CommentCount:
+
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_count(self, review_id):
+        from reviews.models import Review
+        return Review.objects.get(pk=review_id).comment_count
+
+    def test_01_comment_count_follows_comments(self, admin_client, admin,
+                                               user_client, user):
+        comments, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        review_id = reviews[0]['id']
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=review_id
+        )
+        initial = self.get_count(review_id)
+        response = admin_client.get(url)
+        assert response.json().get('comment_count') == initial, (
+            'Проверьте, что отзыв содержит поле `comment_count` с числом '
+            'комментариев.'
+        )
+
+        create_single_comment(
+            user_client, titles[0]['id'], review_id, 'Комментарий'
+        )
+        assert self.get_count(review_id) == initial + 1, (
+            'Проверьте, что при создании комментария число комментариев '
+            'отзыва увеличивается.'
+        )
+        response = admin_client.get(url)
+        assert response.json()['comment_count'] == initial + 1, (
+            'Проверьте, что ответ с отзывом не отдаётся из устаревшего кеша '
+            'после добавления комментария.'
+        )
+
+        user.delete()
+        assert self.get_count(review_id) == initial, (
+            'Проверьте, что при каскадном удалении комментариев вместе с '
+            'автором число комментариев отзыва уменьшается.'
+        )
+
+    def test_02_recalculate_comment_counts(self, admin_client, admin):
+        from reviews.models import Comment, Review
+        _, reviews, _ = create_comments(admin_client, {admin: admin_client})
+        expected = {
+            review['id']: Comment.objects.filter(
+                review_id=review['id']
+            ).count()
+            for review in reviews
+        }
+        Review.objects.update(comment_count=0)
+
+        call_command('recalculate_comment_counts')
+
+        assert {
+            review['id']: self.get_count(review['id']) for review in reviews
+        } == expected, (
+            'Проверьте, что команда `recalculate_comment_counts` '
+            'восстанавливает число комментариев по существующим '
+            'комментариям.'
+        )
+
+    def test_03_review_delete_skips_comment_count(self, admin_client, admin):
+        from reviews.models import Review, Title
+        _, reviews, titles = create_comments(
+            admin_client, {admin: admin_client}
+        )
+        review_id = reviews[0]['id']
+        add_comments(review_id, admin, 10)
+        Review.objects.recalculate_comment_counts()
+        url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=review_id
+        )
+        with CaptureQueriesContext(connection) as context:
+            admin_client.delete(url)
+        assert not any(
+            query['sql'].startswith('UPDATE "reviews_review"')
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что при удалении отзыва не обновляется число '
+            'комментариев удаляемого отзыва.'
+        )
+        title = Title.objects.get(pk=titles[0]['id'])
+        expected = Review.objects.filter(title=title).count()
+        assert title.review_count == expected, (
+            'Проверьте, что при удалении отзыва обновляется рейтинг '
+            'произведения.'
+        )
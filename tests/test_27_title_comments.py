@@ -0,0 +1,83 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import add_comments, add_reviews, collect_pages, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27TitleComments:
+
+    URL_TEMPLATE = '/api/v1/titles/{title_id}/comments/'
+
+    def test_01_title_comment_stream(self, client, admin_client, admin):
+        from reviews.models import Comment, Review
+        titles, _, _ = create_titles(admin_client)
+        add_reviews(titles[0]['id'], 3)
+        add_reviews(titles[1]['id'], 1)
+        for review in Review.objects.all():
+            add_comments(review.id, admin, 5)
+        expected = list(
+            Comment.objects.filter(
+                review__title_id=titles[0]['id']
+            ).order_by('pub_date', 'id').values_list('id', 'review_id')
+        )
+        url = self.URL_TEMPLATE.format(title_id=titles[0]['id'])
+
+        results, pages = collect_pages(client, url)
+        assert [
+            (comment['id'], comment['review']) for comment in results
+        ] == expected, (
+            f'Проверьте, что `{url}` возвращает комментарии ко всем отзывам '
+            'произведения с id отзыва в порядке публикации.'
+        )
+        assert len(pages) == 2 and all(
+            comment['author'] == admin.username for comment in results
+        ), (
+            f'Проверьте, что `{url}` использует пагинацию по курсору и '
+            'возвращает автора комментария.'
+        )
+
+    def test_02_title_comment_stream_queries(self, client, admin_client,
+                                             admin):
+        from reviews.models import Review
+        titles, _, _ = create_titles(admin_client)
+        add_reviews(titles[0]['id'], 3)
+        url = self.URL_TEMPLATE.format(title_id=titles[0]['id'])
+        with CaptureQueriesContext(connection) as context:
+            client.get(url)
+        empty_queries = len(context.captured_queries)
+        for review in Review.objects.all():
+            add_comments(review.id, admin, 5)
+        with CaptureQueriesContext(connection) as context:
+            client.get(url)
+        assert len(context.captured_queries) == empty_queries == 2, (
+            f'Проверьте, что `{url}` выбирает комментарии одним запросом '
+            'независимо от числа отзывов.'
+        )
+
+    def test_03_missing_title(self, client):
+        response = client.get(self.URL_TEMPLATE.format(title_id=100500))
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что лента комментариев несуществующего произведения '
+            'возвращает ответ со статусом 404.'
+        )
+
+    def test_04_review_moved(self, client, admin_client, admin):
+        from reviews.models import Review, Title
+        titles, _, _ = create_titles(admin_client)
+        add_reviews(titles[0]['id'], 1)
+        Title.objects.recalculate_ratings()
+        review = Review.objects.get()
+        add_comments(review.id, admin, 2)
+        review.title_id = titles[1]['id']
+        review.save()
+        for title, expected in ((titles[0], 0), (titles[1], 2)):
+            url = self.URL_TEMPLATE.format(title_id=title['id'])
+            results, _ = collect_pages(client, url)
+            assert len(results) == expected, (
+                'Проверьте, что комментарии переносятся в ленту '
+                'произведения вместе со своим отзывом.'
+            )
@@ -0,0 +1,135 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import add_comments, add_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28Moderation:
+
+    REVIEWS_DELETE_URL = '/api/v1/moderation/reviews/delete/'
+    COMMENTS_DELETE_URL = '/api/v1/moderation/comments/delete/'
+
+    def test_01_delete_reviews_by_ids(self, admin_client, moderator_client,
+                                      admin):
+        from reviews.models import Comment, Review, Title
+        titles, _, _ = create_titles(admin_client)
+        add_reviews(titles[0]['id'], 3)
+        add_reviews(titles[1]['id'], 2)
+        Title.objects.recalculate_ratings()
+        review_ids = list(Review.objects.order_by('id').values_list(
+            'id', flat=True
+        ))
+        add_comments(review_ids[0], admin, 4)
+
+        response = moderator_client.post(
+            self.REVIEWS_DELETE_URL,
+            data={'ids': [review_ids[0], review_ids[3]]},
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что POST-запрос модератора к '
+            f'`{self.REVIEWS_DELETE_URL}` возвращает ответ со статусом 200.'
+        )
+        assert response.json() == {'reviews': 2, 'comments': 4}, (
+            'Проверьте, что ответ содержит число удалённых отзывов и '
+            'комментариев.'
+        )
+        assert not Comment.objects.exists(), (
+            'Проверьте, что комментарии удаляются вместе с отзывами.'
+        )
+        assert list(Title.objects.order_by('id').values_list(
+            'review_count', flat=True
+        )) == [2, 1], (
+            'Проверьте, что после массового удаления рейтинги произведений '
+            'пересчитываются.'
+        )
+
+    def test_02_delete_comments_by_author(self, admin_client,
+                                          moderator_client, admin,
+                                          moderator):
+        from reviews.models import Comment, Review
+        titles, _, _ = create_titles(admin_client)
+        add_reviews(titles[0]['id'], 2)
+        first, second = Review.objects.order_by('id')
+        add_comments(first.id, admin, 3)
+        add_comments(second.id, admin, 2)
+        add_comments(second.id, moderator, 1)
+        Review.objects.recalculate_comment_counts()
+
+        response = moderator_client.post(
+            self.COMMENTS_DELETE_URL,
+            data={'author': admin.username},
+            format='json'
+        )
+        assert response.json() == {'reviews': 0, 'comments': 5}, (
+            'Проверьте, что комментарии удаляются по автору.'
+        )
+        assert Comment.objects.get().author == moderator
+        assert list(Review.objects.order_by('id').values_list(
+            'comment_count', flat=True
+        )) == [0, 1], (
+            'Проверьте, что после массового удаления число комментариев '
+            'отзывов пересчитывается.'
+        )
+
+    def test_03_aggregates_recalculated_per_batch(self, admin_client,
+                                                  moderator_client):
+        from reviews.models import Review
+        titles, _, _ = create_titles(admin_client)
+        add_reviews(titles[0]['id'], 2)
+        ids = list(Review.objects.values_list('id', flat=True))
+        with CaptureQueriesContext(connection) as context:
+            moderator_client.post(
+                self.REVIEWS_DELETE_URL, data={'ids': ids}, format='json'
+            )
+        few_queries = len(context.captured_queries)
+        add_reviews(titles[0]['id'], 30)
+        ids = list(Review.objects.values_list('id', flat=True))
+        with CaptureQueriesContext(connection) as context:
+            moderator_client.post(
+                self.REVIEWS_DELETE_URL, data={'ids': ids}, format='json'
+            )
+        assert len(context.captured_queries) == few_queries, (
+            'Проверьте, что число запросов к БД при массовом удалении не '
+            'зависит от числа отзывов в пачке.'
+        )
+
+    def test_04_permissions_and_validation(self, user_client,
+                                           moderator_client):
+        response = user_client.post(
+            self.REVIEWS_DELETE_URL, data={'ids': [1]}, format='json'
+        )
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что массовое удаление недоступно пользователю.'
+        )
+        response = moderator_client.post(
+            self.REVIEWS_DELETE_URL, data={}, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что для массового удаления нужно указать список id '
+            'или автора.'
+        )
+
+    def test_05_delete_in_several_batches(self, admin_client):
+        from reviews.models import Review, Title
+        from reviews.moderation import delete_reviews, get_deleted_counts
+        titles, _, _ = create_titles(admin_client)
+        add_reviews(titles[0]['id'], 5)
+        add_reviews(titles[1]['id'], 1)
+        Title.objects.recalculate_ratings()
+
+        deleted = delete_reviews(
+            Review.objects.filter(title_id=titles[0]['id']), batch_size=2
+        )
+        assert get_deleted_counts(deleted) == {'reviews': 5, 'comments': 0}, (
+            'Проверьте, что удаление пачками удаляет все подходящие отзывы.'
+        )
+        assert list(Title.objects.order_by('id').values_list(
+            'review_count', flat=True
+        )) == [0, 1], (
+            'Проверьте, что рейтинги пересчитываются после каждой пачки.'
+        )
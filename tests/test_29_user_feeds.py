@@ -0,0 +1,107 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import add_comments, collect_pages, get_query_plan
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29UserFeeds:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/users/{username}/reviews/'
+    COMMENTS_URL_TEMPLATE = '/api/v1/users/{username}/comments/'
+
+    @staticmethod
+    def create_title(idx):
+        from reviews.models import Title
+        return Title.objects.create(name=f'Произведение {idx}', year=2000).id
+
+    def test_01_user_reviews(self, client, user_client, admin_client, user,
+                             admin):
+        from reviews.models import Review
+        for idx in range(12):
+            Review.objects.create(
+                text=f'Отзыв {idx}', score=5, author=user,
+                title_id=self.create_title(idx)
+            )
+        Review.objects.create(
+            text='Чужой отзыв', score=5, author=admin,
+            title_id=self.create_title(100)
+        )
+        expected = list(Review.objects.filter(author=user).order_by(
+            '-pub_date', '-id'
+        ).values_list('id', 'title_id'))
+
+        url = self.REVIEWS_URL_TEMPLATE.format(username=user.username)
+        results, pages = collect_pages(client, url)
+        assert [
+            (review['id'], review['title']) for review in results
+        ] == expected, (
+            f'Проверьте, что `{url}` возвращает отзывы пользователя с id '
+            'произведения от новых к старым.'
+        )
+        assert len(pages) == 2, (
+            f'Проверьте, что `{url}` использует пагинацию по курсору.'
+        )
+
+        results, _ = collect_pages(
+            user_client, self.REVIEWS_URL_TEMPLATE.format(username='me')
+        )
+        assert [review['id'] for review in results] == [
+            pk for pk, _ in expected
+        ], (
+            'Проверьте, что `/api/v1/users/me/reviews/` возвращает отзывы '
+            'текущего пользователя.'
+        )
+
+    def test_02_user_comments(self, client, admin_client, admin, user):
+        from reviews.models import Review
+        review = Review.objects.create(
+            text='Отзыв', score=5, author=admin,
+            title_id=self.create_title(0)
+        )
+        add_comments(review.id, user, 3)
+        add_comments(review.id, admin, 2)
+
+        results, _ = collect_pages(
+            client, self.COMMENTS_URL_TEMPLATE.format(username=user.username)
+        )
+        assert len(results) == 3 and all(
+            comment['author'] == user.username
+            and comment['review'] == review.id
+            for comment in results
+        ), (
+            'Проверьте, что лента комментариев пользователя содержит только '
+            'его комментарии с id отзыва.'
+        )
+
+    def test_03_me_and_missing_user(self, client):
+        response = client.get(self.REVIEWS_URL_TEMPLATE.format(username='me'))
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что `/api/v1/users/me/reviews/` недоступна без '
+            'токена.'
+        )
+        response = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(username='nobody')
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что лента несуществующего пользователя возвращает '
+            'ответ со статусом 404.'
+        )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('model_name', ('Review', 'Comment'))
+def test_user_feed_query_plan(model_name):
+    from django.utils import timezone
+    from reviews import models
+    queryset = getattr(models, model_name).objects.filter(
+        author_id=1, pub_date__lt=timezone.now()
+    ).order_by('-pub_date', '-id')[:11]
+    plan = get_query_plan(queryset)
+    assert any('author_pub_date_idx' in step for step in plan) and not any(
+        'TEMP B-TREE' in step for step in plan
+    ), (
+        f'Проверьте, что лента пользователя для {model_name} выбирается по '
+        f'индексу (author, pub_date, id) без сортировки: {plan}'
+    )
@@ -0,0 +1,114 @@
+import pytest
+
+from tests.utils import get_query_plan
+
+PARENTS = {
+    'Review': 'title_id',
+    'Comment': 'review_id',
+}
+ORDERINGS = {
+    'page': (),
+    'keyset': ('pub_date', 'id'),
+    'keyset-reverse': ('-pub_date', '-id'),
+}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('ordering', ORDERINGS)
+@pytest.mark.parametrize('model_name', PARENTS)
+def test_nested_list_query_plan(model_name, ordering):
+    from django.utils import timezone
+    from api.v1.pagination import KeysetPagination
+    from reviews import models
+    queryset = getattr(models, model_name).objects.select_related(
+        'author'
+    ).filter(**{PARENTS[model_name]: 1})
+    keyset_ordering = ORDERINGS[ordering]
+    if keyset_ordering:
+        queryset = queryset.order_by(*keyset_ordering).filter(
+            KeysetPagination.get_position_filter(
+                keyset_ordering, (timezone.now(), 1)
+            )
+        )
+    plan = get_query_plan(queryset[:11])
+    assert any('_pub_date_idx' in step for step in plan) and not any(
+        'TEMP B-TREE' in step for step in plan
+    ), (
+        f'Проверьте, что список {model_name} по {PARENTS[model_name]} '
+        f'выбирается по индексу ({PARENTS[model_name][:-3]}, pub_date, id) '
+        f'без сортировки: {plan}'
+    )
+    if keyset_ordering:
+        assert_seeks_to_cursor(plan, 'pub_date')
+
+
+def assert_seeks_to_cursor(plan, field):
+    assert any(
+        f'{field}>?' in step or f'{field}<?' in step for step in plan
+    ), (
+        'Проверьте, что страница с курсором начинает чтение индекса с '
+        f'позиции курсора по полю {field}, а не с начала: {plan}'
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('ordering', ('keyset', 'keyset-reverse'))
+def test_title_comments_query_plan(ordering):
+    from django.utils import timezone
+    from api.v1.pagination import KeysetPagination
+    from reviews.models import Comment
+    keyset_ordering = ORDERINGS[ordering]
+    queryset = Comment.objects.select_related('author').filter(
+        title_id=1
+    ).order_by(*keyset_ordering).filter(
+        KeysetPagination.get_position_filter(
+            keyset_ordering, (timezone.now(), 1)
+        )
+    )
+    plan = get_query_plan(queryset[:11])
+    assert any('comment_title_pub_date_idx' in step for step in plan) and (
+        not any('TEMP B-TREE' in step for step in plan)
+    ), (
+        'Проверьте, что лента комментариев произведения выбирается по '
+        f'индексу (title, pub_date, id) без сортировки: {plan}'
+    )
+    assert_seeks_to_cursor(plan, 'pub_date')
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('keyset_ordering', (('name', 'id'), ('-name', '-id')))
+def test_title_cursor_query_plan(keyset_ordering):
+    from api.v1.pagination import KeysetPagination
+    from api.v1.views import TitleViewSet
+    queryset = TitleViewSet.queryset.order_by(*keyset_ordering).filter(
+        KeysetPagination.get_position_filter(keyset_ordering, ('Фильм', 1))
+    )
+    plan = get_query_plan(queryset[:11])
+    assert not any('TEMP B-TREE' in step for step in plan), (
+        'Проверьте, что страница произведений с курсором выбирается по '
+        f'индексу (name, id) без сортировки: {plan}'
+    )
+    assert_seeks_to_cursor(plan, 'name')
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('model_name', PARENTS)
+def test_no_foreign_key_prefix_indexes(model_name):
+    from django.db import connection
+    from reviews import models
+    model = getattr(models, model_name)
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, model._meta.db_table
+        )
+    single_column = {
+        tuple(constraint['columns'])
+        for constraint in constraints.values()
+        if constraint['index'] and len(constraint['columns']) == 1
+    }
+    redundant = single_column & {('author_id',), (PARENTS[model_name],)}
+    assert not redundant, (
+        f'Проверьте, что у {model_name} нет отдельных индексов по '
+        f'{redundant}: их заменяют составные индексы с тем же первым '
+        'полем.'
+    )
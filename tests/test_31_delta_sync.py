@@ -0,0 +1,272 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import (
+    add_comments, add_reviews, create_single_comment, create_single_review,
+    create_titles, get_query_plan
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31DeltaSync:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    @staticmethod
+    def get_data(client, url, params=None):
+        response = client.get(url, params)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        return response.json()
+
+    def test_01_updated_at(self, admin_client, user_client):
+        from reviews.models import Review, Title
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        review_id = create_single_review(
+            user_client, title_id, 'Отзыв', 5
+        ).json()['id']
+        review_updated_at = Review.objects.get().updated_at
+        title_updated_at = Title.objects.get(pk=title_id).updated_at
+
+        create_single_comment(admin_client, title_id, review_id, 'Ответ')
+        assert Review.objects.get().updated_at > review_updated_at, (
+            'Проверьте, что новый комментарий обновляет `updated_at` '
+            'отзыва вместе с числом комментариев.'
+        )
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[1]["id"]}/', data={'year': 1999}
+        )
+        user_client.patch(
+            f'{self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)}'
+            f'{review_id}/',
+            data={'score': 1}
+        )
+        assert Title.objects.get(pk=title_id).updated_at > (
+            title_updated_at
+        ), (
+            'Проверьте, что изменение рейтинга обновляет `updated_at` '
+            'произведения.'
+        )
+
+    def test_02_since_filter(self, client, admin_client):
+        from reviews.models import Title
+        titles, _, _ = create_titles(admin_client)
+        since = Title.objects.get(pk=titles[1]['id']).updated_at
+        data = self.get_data(
+            client, self.TITLES_URL, {'since': since.isoformat()}
+        )
+        assert [title['id'] for title in data['results']] == [
+            titles[1]['id']
+        ], (
+            'Проверьте, что параметр `since` оставляет только '
+            'произведения, изменённые начиная с указанного момента.'
+        )
+
+        admin_client.patch(
+            f'{self.TITLES_URL}{titles[0]["id"]}/', data={'year': 1999}
+        )
+        data = self.get_data(client, self.TITLES_URL, {
+            'since': since.isoformat(), 'cursor': ''
+        })
+        assert [title['id'] for title in data['results']] == [
+            titles[1]['id'], titles[0]['id']
+        ], (
+            'Проверьте, что с параметром `since` произведения упорядочены '
+            'по времени изменения.'
+        )
+
+        response = client.get(self.TITLES_URL, {'since': 'вчера'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что некорректный параметр `since` возвращает ответ '
+            'со статусом 400.'
+        )
+
+    def test_03_since_nested_cursor(self, client, admin_client, admin):
+        from reviews.models import Review
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        add_reviews(title_id, 12)
+        first, *_, last = Review.objects.order_by('id')
+        last.text = 'Изменён'
+        last.save()
+        first.text = 'Изменён'
+        first.save()
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        params = {'since': last.updated_at.isoformat(), 'cursor': ''}
+        data = self.get_data(client, url, params)
+        assert [review['id'] for review in data['results']] == [
+            last.id, first.id
+        ], (
+            'Проверьте, что параметр `since` оставляет в списке отзывов '
+            'только изменённые отзывы в порядке изменения.'
+        )
+
+        add_comments(first.id, admin, 3)
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title_id, review_id=first.id
+        )
+        data = self.get_data(
+            client, comments_url, {'since': '2000-01-01T00:00:00'}
+        )
+        assert len(data['results']) == 3, (
+            'Проверьте, что параметр `since` поддерживается списком '
+            'комментариев.'
+        )
+
+    def test_04_deleted(self, client, admin_client, moderator_client, admin):
+        from reviews.models import Review, Title, Tombstone
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        add_reviews(title_id, 3)
+        Title.objects.recalculate_ratings()
+        first, second, third = Review.objects.order_by('id')
+        add_comments(first.id, admin, 2)
+        comment_ids = list(first.comments.values_list('id', flat=True))
+
+        second_id = second.id
+        second.delete()
+        moderator_client.post(
+            '/api/v1/moderation/reviews/delete/',
+            data={'ids': [first.id]}, format='json'
+        )
+        url = f'{self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)}deleted/'
+        data = self.get_data(client, url)
+        assert [review['id'] for review in data['results']] == [
+            second_id, first.id
+        ], (
+            f'Проверьте, что `{url}` возвращает удалённые отзывы '
+            'произведения в порядке удаления.'
+        )
+        since = data['results'][-1]['deleted_at']
+        data = self.get_data(client, url, {'since': since})
+        assert [review['id'] for review in data['results']] == [first.id], (
+            f'Проверьте, что `{url}` учитывает параметр `since`.'
+        )
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title_id, review_id=third.id
+        )
+        assert self.get_data(client, f'{comments_url}deleted/')[
+            'results'
+        ] == [], (
+            'Проверьте, что удалённые комментарии отдаются только для '
+            'своего отзыва.'
+        )
+
+        assert sorted(Tombstone.objects.filter(
+            model_name='comment', parent_id=first.id
+        ).values_list('object_id', flat=True)) == comment_ids, (
+            'Проверьте, что при массовом удалении отзывов записываются '
+            'удаления их комментариев.'
+        )
+
+        admin_client.delete(f'{self.TITLES_URL}{title_id}/')
+        data = self.get_data(client, f'{self.TITLES_URL}deleted/')
+        assert [title['id'] for title in data['results']] == [title_id], (
+            'Проверьте, что удалённые произведения отдаются по адресу '
+            f'`{self.TITLES_URL}deleted/`.'
+        )
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что удалённые отзывы несуществующего произведения '
+            'возвращают ответ со статусом 404.'
+        )
+
+    def test_05_bulk_update(self, admin_client):
+        from reviews.models import Title
+        titles, _, _ = create_titles(admin_client)
+        updated_at = Title.objects.get(pk=titles[0]['id']).updated_at
+        response = admin_client.post(
+            f'{self.TITLES_URL}bulk/',
+            data=[
+                {'id': titles[0]['id'], 'genre': ['drama']},
+                {
+                    'name': 'Новое', 'year': 2000, 'genre': ['drama'],
+                    'category': 'films'
+                },
+            ],
+            format='json'
+        )
+        assert [result['status'] for result in response.json()] == [
+            HTTPStatus.OK, HTTPStatus.CREATED
+        ], 'Проверьте, что пакетная запись принимает корректные элементы.'
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert title.updated_at > updated_at, (
+            'Проверьте, что пакетное обновление заполняет `updated_at`.'
+        )
+        assert Title.objects.get(name='Новое').updated_at > updated_at, (
+            'Проверьте, что пакетное создание заполняет `updated_at`.'
+        )
+
+    def test_06_since_count_not_cached(self, client, admin_client,
+                                       user_client):
+        from django.utils import timezone
+        titles, _, _ = create_titles(admin_client)
+        params = {'since': timezone.now().isoformat()}
+        data = self.get_data(client, self.TITLES_URL, params)
+        assert data['count'] == 0
+
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 5)
+        data = self.get_data(client, self.TITLES_URL, params)
+        assert data['count'] == 1 and [
+            title['id'] for title in data['results']
+        ] == [titles[0]['id']], (
+            'Проверьте, что произведение, у которого после момента `since` '
+            'изменился рейтинг, попадает в выдачу и в поле `count`.'
+        )
+
+    def test_07_destroy_tombstones(self, admin_client, admin):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from reviews.models import Review, Title, Tombstone
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        add_reviews(title_id, 10)
+        Title.objects.recalculate_ratings()
+        add_comments(Review.objects.first().id, admin, 10)
+        Review.objects.recalculate_comment_counts()
+        with CaptureQueriesContext(connection) as context:
+            admin_client.delete(f'{self.TITLES_URL}{title_id}/')
+        inserts = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('INSERT INTO "reviews_tombstone"')
+        ]
+        assert Tombstone.objects.count() == 21 and len(inserts) == 1, (
+            'Проверьте, что при удалении произведения записи об удалении '
+            'его отзывов и комментариев сохраняются одним запросом.'
+        )
+        assert not any(
+            query['sql'].startswith('UPDATE')
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что при удалении произведения не пересчитываются '
+            'рейтинг произведения и счётчики комментариев его отзывов.'
+        )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('model_name, parent_field', (
+    ('Title', None), ('Review', 'title_id'), ('Comment', 'review_id'),
+))
+def test_since_query_plan(model_name, parent_field):
+    from django.utils import timezone
+    from reviews import models
+    queryset = getattr(models, model_name).objects.filter(
+        updated_at__gte=timezone.now()
+    ).order_by('updated_at', 'id')
+    if parent_field:
+        queryset = queryset.filter(**{parent_field: 1})
+    plan = get_query_plan(queryset[:11])
+    assert any('updated_at_idx' in step for step in plan) and not any(
+        'TEMP B-TREE' in step for step in plan
+    ), (
+        f'Проверьте, что изменения {model_name} выбираются по индексу '
+        f'с updated_at без сортировки: {plan}'
+    )
@@ -0,0 +1,198 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import add_comments, add_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test32BackgroundDeletion:
+
+    TITLES_URL = '/api/v1/titles/'
+    USERS_URL = '/api/v1/users/'
+
+    @pytest.fixture(autouse=True)
+    def background_deletion(self, settings):
+        settings.CASCADE_DELETE_IN_BACKGROUND = True
+
+    def test_01_title(self, client, admin_client, admin):
+        from reviews.models import (
+            CascadeDeletion, Comment, DeletionStatus, Review, Title,
+            Tombstone
+        )
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        add_reviews(title_id, 5)
+        Title.objects.recalculate_ratings()
+        review = Review.objects.first()
+        add_comments(review.id, admin, 3)
+        Review.objects.recalculate_comment_counts()
+        client.get(self.TITLES_URL)
+        feed_urls = (
+            f'{self.USERS_URL}{review.author.username}/reviews/',
+            f'{self.USERS_URL}{admin.username}/comments/',
+        )
+        for url in feed_urls:
+            client.get(url)
+        nested_urls = (
+            f'{self.TITLES_URL}{title_id}/reviews/',
+            f'{self.TITLES_URL}{title_id}/reviews/{review.id}/comments/',
+        )
+        etags = {url: client.get(url).get('ETag') for url in nested_urls}
+
+        response = admin_client.delete(f'{self.TITLES_URL}{title_id}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT, (
+            'Проверьте, что DELETE-запрос администратора к произведению '
+            'при фоновом удалении возвращает ответ со статусом 204.'
+        )
+        assert Review.objects.count() == 5, (
+            'Проверьте, что при фоновом удалении отзывы не удаляются в '
+            'запросе.'
+        )
+        for url in (
+            f'{self.TITLES_URL}{title_id}/',
+            f'{self.TITLES_URL}{title_id}/reviews/',
+            f'{self.TITLES_URL}{title_id}/reviews/{review.id}/',
+            f'{self.TITLES_URL}{title_id}/reviews/{review.id}/comments/',
+        ):
+            assert client.get(url).status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что `{url}` недоступен сразу после постановки '
+                'произведения в очередь на удаление.'
+            )
+        for url, etag in etags.items():
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что `{url}` со старым `If-None-Match` не '
+                'возвращает 304 после постановки произведения в очередь '
+                'на удаление.'
+            )
+        names = [title['name'] for title in client.get(
+            self.TITLES_URL
+        ).json()['results']]
+        assert names == [titles[1]['name']], (
+            'Проверьте, что произведение в очереди на удаление не попадает '
+            'в список произведений.'
+        )
+        for url in feed_urls:
+            assert client.get(url).json()['results'] == [], (
+                f'Проверьте, что `{url}` не отдаёт отзывы и комментарии '
+                'произведения в очереди на удаление.'
+            )
+        task = CascadeDeletion.objects.get()
+        assert (task.status, task.reviews_total, task.comments_total) == (
+            DeletionStatus.PENDING, 5, 3
+        ), (
+            'Проверьте, что задача удаления сохраняет число отзывов и '
+            'комментариев к удалению.'
+        )
+
+        call_command('process_deletions', batch_size=2)
+        task.refresh_from_db()
+        assert (task.status, task.reviews_deleted, task.comments_deleted) == (
+            DeletionStatus.DONE, 5, 3
+        ), 'Проверьте, что задача удаления отражает ход удаления.'
+        assert not Title.objects.filter(pk=title_id).exists() and not (
+            Review.objects.exists() or Comment.objects.exists()
+        ), (
+            'Проверьте, что команда `process_deletions` удаляет '
+            'произведение с отзывами и комментариями.'
+        )
+        assert Tombstone.objects.filter(
+            model_name='title', object_id=title_id
+        ).count() == 1, (
+            'Проверьте, что удаление произведения записывается для '
+            'синхронизации один раз.'
+        )
+
+    def test_02_user(self, client, admin_client, user_client, user, admin):
+        from reviews.models import CascadeDeletion, Comment, Review, Title
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        add_reviews(title_id, 2)
+        own_review = Review.objects.create(
+            text='Отзыв', score=1, author=user, title_id=title_id
+        )
+        other_review = Review.objects.exclude(author=user).first()
+        add_comments(own_review.id, admin, 2)
+        add_comments(other_review.id, user, 3)
+        add_comments(other_review.id, admin, 1)
+        Title.objects.recalculate_ratings()
+        Review.objects.recalculate_comment_counts()
+
+        response = admin_client.delete(f'{self.USERS_URL}{user.username}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT, (
+            'Проверьте, что DELETE-запрос администратора к пользователю '
+            'при фоновом удалении возвращает ответ со статусом 204.'
+        )
+        assert admin_client.get(
+            f'{self.USERS_URL}{user.username}/'
+        ).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что пользователь в очереди на удаление скрыт.'
+        )
+        assert client.get(
+            f'{self.USERS_URL}{user.username}/reviews/'
+        ).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что лента пользователя в очереди на удаление '
+            'недоступна.'
+        )
+        assert user_client.get(
+            f'{self.USERS_URL}me/'
+        ).status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что пользователь в очереди на удаление не может '
+            'пользоваться API.'
+        )
+
+        call_command('process_deletions')
+        assert not type(user).objects.filter(pk=user.pk).exists(), (
+            'Проверьте, что команда `process_deletions` удаляет '
+            'пользователя.'
+        )
+        assert not Comment.objects.filter(author=user).exists() and (
+            not Review.objects.filter(pk=own_review.pk).exists()
+        ), 'Проверьте, что удаляются отзывы и комментарии пользователя.'
+        other_review.refresh_from_db()
+        assert other_review.comment_count == 1, (
+            'Проверьте, что после удаления комментариев пользователя '
+            'пересчитывается их число у чужих отзывов.'
+        )
+        assert Title.objects.get(pk=title_id).review_count == 2, (
+            'Проверьте, что после удаления отзывов пользователя '
+            'пересчитывается рейтинг произведения.'
+        )
+        task = CascadeDeletion.objects.get()
+        assert (task.reviews_deleted, task.comments_deleted) == (1, 5), (
+            'Проверьте, что задача удаления учитывает комментарии к '
+            'отзывам пользователя.'
+        )
+
+    def test_03_disabled(self, settings, admin_client, user, admin):
+        from reviews.models import CascadeDeletion, Review, Title
+        settings.CASCADE_DELETE_IN_BACKGROUND = False
+        titles, _, _ = create_titles(admin_client)
+        admin_client.delete(f'{self.TITLES_URL}{titles[0]["id"]}/')
+        assert not Title.objects.filter(pk=titles[0]['id']).exists() and (
+            not CascadeDeletion.objects.exists()
+        ), (
+            'Проверьте, что без настройки CASCADE_DELETE_IN_BACKGROUND '
+            'произведение удаляется сразу.'
+        )
+
+        title_id = titles[1]['id']
+        add_reviews(title_id, 1)
+        own_review = Review.objects.create(
+            text='Отзыв', score=1, author=user, title_id=title_id
+        )
+        other_review = Review.objects.exclude(author=user).get()
+        add_comments(own_review.id, admin, 2)
+        add_comments(other_review.id, user, 3)
+        add_comments(other_review.id, admin, 1)
+        Title.objects.recalculate_ratings()
+        Review.objects.recalculate_comment_counts()
+        admin_client.delete(f'{self.USERS_URL}{user.username}/')
+        other_review.refresh_from_db()
+        title = Title.objects.get(pk=title_id)
+        assert (other_review.comment_count, title.review_count) == (1, 1), (
+            'Проверьте, что после сразу удалённого пользователя '
+            'пересчитываются рейтинги и счётчики комментариев.'
+        )
@@ -1,5 +1,8 @@
 from http import HTTPStatus
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 
 check_name_and_slug_patterns = (
     (
@@ -305,3 +308,108 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f'данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не '
         'найдено или не является целым числом.'
     )
+
+
+def create_many_titles(count):
+    from reviews.models import Category, Genre, Title
+    categories = Category.objects.all()
+    genres = Genre.objects.all()
+    for idx in range(count):
+        title = Title.objects.create(
+            name=f'Произведение {idx}',
+            year=2000,
+            category=categories[idx % len(categories)]
+        )
+        title.genre.set(genres)
+
+
+def add_reviews(title_id, count):
+    from django.contrib.auth import get_user_model
+    from reviews.models import Review
+    User = get_user_model()
+    start = User.objects.filter(username__startswith='author_').count()
+    usernames = [f'author_{idx}' for idx in range(start, start + count)]
+    User.objects.bulk_create(
+        User(username=username, email=f'{username}@yamdb.fake')
+        for username in usernames
+    )
+    users = User.objects.filter(username__in=usernames)
+    Review.objects.bulk_create(
+        Review(text='Отзыв', score=5, author=user, title_id=title_id)
+        for user in users
+    )
+
+
+def add_comments(review_id, author, count):
+    from reviews.models import Comment, Review
+    title_id = Review.objects.get(pk=review_id).title_id
+    Comment.objects.bulk_create(
+        Comment(
+            text='Комментарий', author=author, review_id=review_id,
+            title_id=title_id
+        )
+        for _ in range(count)
+    )
+
+
+def count_queries(client, url, method='get', data=None):
+    with CaptureQueriesContext(connection) as context:
+        response = getattr(client, method)(url, data=data)
+    assert response.status_code < 400, (
+        f'Запрос к `{url}` завершился с ошибкой {response.status_code}.'
+    )
+    return len(context.captured_queries)
+
+
+def get_with_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, (
+        f'Проверьте, что GET-запрос к `{url}` возвращает ответ со статусом '
+        '200.'
+    )
+    return response.json(), [
+        query['sql'] for query in context.captured_queries
+    ]
+
+
+def post_with_queries(client, url, data):
+    with CaptureQueriesContext(connection) as context:
+        response = client.post(url, data=data)
+    return response, [query['sql'] for query in context.captured_queries]
+
+
+def parent_selects(queries, table):
+    return [
+        sql for sql in queries
+        if sql.startswith('SELECT') and f'FROM "{table}"' in sql
+    ]
+
+
+def collect_pages(client, url, link='next'):
+    results, pages = [], []
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` с параметром `cursor` '
+            'возвращает ответ со статусом 200.'
+        )
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что при пагинации по курсору ответ не содержит '
+            'ключ `count`.'
+        )
+        pages.append(data)
+        if link == 'next':
+            results = results + data['results']
+        else:
+            results = data['results'] + results
+        url = data[link]
+    return results, pages
+
+
+def get_query_plan(queryset):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[-1] for row in cursor.fetchall()]